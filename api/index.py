@@ -1,6 +1,7 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
+from datetime import date, timedelta
 from urllib.parse import urlparse, parse_qs
 
 # Supabase setup
@@ -162,73 +163,27 @@ Respond ONLY with this JSON format:
                 self._send_json(400, {"error": "Maximum 6 legs allowed"})
                 return
             
-            # Format legs for Claude
-            legs_text = ""
-            for i, leg in enumerate(legs, 1):
-                legs_text += f"""
-Leg {i}: {leg['player']} {leg['direction']} {leg['line']} {leg['stat']} vs {leg['opponent']}
-  - Individual probability: {leg['probability']}%
-"""
+            # Price the parlay locally: Monte Carlo over correlated legs
+            from utils.parlay import ParlayEngine
             
-            client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            player_stats = None
+            player_ids = [leg['player_id'] for leg in legs if leg.get('player_id')]
+            if player_ids and SUPABASE_URL and SUPABASE_KEY:
+                try:
+                    from utils.database import get_db
+                    start_date = date.today() - timedelta(days=365)
+                    player_stats = get_db().get_stats_for_players(player_ids, start_date)
+                except Exception as e:
+                    print(f"Parlay history unavailable: {e}")
             
-            prompt = f"""You are an NBA statistics expert analyzing a parlay bet. The user has combined multiple prop bets into one parlay.
-
-PARLAY LEGS:
-{legs_text}
-
-Analyze this parlay and provide:
-1. COMBINED PROBABILITY: Calculate the realistic combined probability. 
-   - Start with multiplying individual probabilities, but adjust for:
-   - Correlation between bets (same game = correlated, different games = independent)
-   - If multiple players from same game, their stats may be inversely correlated
-   - Typically parlays have lower real probability than simple multiplication suggests
-
-2. CHECK FOR CORRELATIONS:
-   - Are any legs from the same game? (increases risk)
-   - Are there conflicting bets? (e.g., two players from same team both going OVER assists)
-   - Same player different stats? (correlated)
-
-3. OVERALL ANALYSIS: Brief assessment of this parlay's quality
-
-Respond ONLY with this JSON format:
-{{
-    "combined_probability": <realistic percentage 0-100>,
-    "implied_odds": <American odds like "250" or "1500" based on probability>,
-    "analysis": "1-2 sentence overall assessment",
-    "correlation_warning": "warning if legs are correlated, or null if independent"
-}}
-
-IMPORTANT RULES:
-- A 2-leg parlay of two 50% bets should be around 20-25% (not exactly 25% due to variance)
-- A 3-leg parlay of three 50% bets should be around 10-12%
-- Add correlation penalties when legs are from same game
-- Be realistic - most parlays are hard to hit"""
-
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            parlay_result = ParlayEngine().price(legs, player_stats)
             
-            response_text = message.content[0].text
-            try:
-                if "```" in response_text:
-                    response_text = response_text.split("```")[1].replace("json", "").strip()
-                parlay_result = json.loads(response_text)
-            except:
-                # Fallback calculation
-                combined = 100
-                for leg in legs:
-                    combined = combined * (leg['probability'] / 100)
-                combined = round(combined * 0.9, 1)  # 10% penalty for variance
-                
-                parlay_result = {
-                    "combined_probability": combined,
-                    "implied_odds": str(round((100 / combined - 1) * 100)) if combined > 0 else "9999",
-                    "analysis": "Parlay calculated using basic probability multiplication.",
-                    "correlation_warning": None
-                }
+            # Claude only writes the optional prose analysis
+            if data.get('include_analysis'):
+                try:
+                    parlay_result['analysis'] = self._parlay_analysis(legs, parlay_result, anthropic)
+                except Exception as e:
+                    print(f"Parlay analysis failed: {e}")
             
             self._send_json(200, {
                 "success": True,
@@ -236,9 +191,40 @@ IMPORTANT RULES:
                 "legs_count": len(legs)
             })
             
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
         except Exception as e:
             self._send_json(500, {"error": str(e)})
     
+    def _parlay_analysis(self, legs, parlay_result, anthropic):
+        """Ask Claude for a short assessment of an already priced parlay"""
+        legs_text = ""
+        for i, leg in enumerate(legs, 1):
+            legs_text += f"""
+Leg {i}: {leg['player']} {leg['direction']} {leg['line']} {leg['stat']} vs {leg['opponent']}
+  - Individual probability: {parlay_result['leg_probabilities'][i - 1]}%
+"""
+        
+        client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        
+        prompt = f"""You are an NBA statistics expert reviewing a parlay bet.
+
+PARLAY LEGS:
+{legs_text}
+SIMULATED COMBINED PROBABILITY: {parlay_result['combined_probability']}%
+(independent legs would give {parlay_result['independent_probability']}%)
+CORRELATION: {parlay_result['correlation_warning'] or 'legs are independent'}
+
+Give a 1-2 sentence assessment of this parlay's quality. Do not recompute the probability.
+Respond with the assessment text only."""
+
+        message = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=200,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return message.content[0].text.strip()
+    
     def _send_json(self, status, data):
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
@@ -4,10 +4,11 @@ Search and list NBA players
 """
 
 from http.server import BaseHTTPRequestHandler
+import os
 import json
 from urllib.parse import parse_qs, urlparse
 
-from utils.api_sports import APISportsClient
+from utils.api_sports import APISportsClient, APISportsError
 
 
 class handler(BaseHTTPRequestHandler):
@@ -35,28 +36,21 @@ class handler(BaseHTTPRequestHandler):
             api_sports = APISportsClient()
             
             if player_id:
-                # Get specific player
-                player = api_sports.get_player(int(player_id))
-                if not player:
+                # Get specific player with their stats (one statistics fetch)
+                profile = api_sports.get_player_profile(int(player_id))
+                if not profile:
                     return self._error_response(404, f"Player not found: {player_id}")
                 
-                # Also get their stats
-                stats = api_sports.get_player_season_averages(int(player_id))
-                recent = api_sports.get_player_recent_form(int(player_id))
-                
-                response = {
-                    "success": True,
-                    "player": player,
-                    "season_stats": stats,
-                    "recent_form": recent
-                }
+                response = {"success": True, **profile}
                 
             elif search:
-                # Search players by name
-                players = api_sports.search_players(search)
+                # Search players by name, from the local index when possible
+                formatted = self._search_index(search)
+                
+                # Fall back to API-Sports (e.g. players not ingested yet)
+                players = [] if formatted else api_sports.search_players(search)
                 
                 # Format results
-                formatted = []
                 for p in players[:20]:  # Limit to 20 results
                     formatted.append({
                         "id": p.get("id"),
@@ -105,10 +99,24 @@ class handler(BaseHTTPRequestHandler):
             
             return self._success_response(response)
             
+        except APISportsError as e:
+            print(f"Players API upstream error: {e}")
+            return self._error_response(429 if e.rate_limited else 502, str(e))
         except Exception as e:
             print(f"Players API error: {e}")
             return self._error_response(500, str(e))
     
+    def _search_index(self, search: str, limit: int = 20) -> list:
+        """Typeahead from the in-memory players index ([] if unavailable)"""
+        if not (os.environ.get("SUPABASE_URL") and os.environ.get("SUPABASE_KEY")):
+            return []
+        try:
+            from utils.player_index import get_player_index
+            return get_player_index().search(search, k=limit)
+        except Exception as e:
+            print(f"Player index unavailable: {e}")
+            return []
+    
     def _success_response(self, data: dict):
         """Send a successful JSON response"""
         self.send_response(200)
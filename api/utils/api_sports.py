@@ -4,16 +4,141 @@ Handles all communication with the API-Sports NBA endpoints
 """
 
 import os
+import json
+import time
+import random
+import threading
 import requests
-from typing import Optional, Dict, List, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List, Any, Tuple, Union
 from datetime import datetime, timedelta
 
+from .game_log import GameLog
+from .response_cache import ResponseCache
+from .quota import QuotaScheduler, QuotaExhausted
+from .replay import recording_session
+from .season_averages import season_averages
+
+
+class APISportsError(Exception):
+    """
+    An API-Sports request that failed after retries
+    
+    status is the HTTP status (None for connection errors/timeouts);
+    errors holds the API's own error payload when it sent one.
+    """
+    
+    def __init__(self, message: str, endpoint: str, status: Optional[int] = None, errors: Any = None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status = status
+        self.errors = errors
+    
+    @property
+    def rate_limited(self) -> bool:
+        return self.status == 429
+
+
+# One keep-alive session per process, reused across warm invocations
+_session = None
+_session_lock = threading.Lock()
+
+
+# Process-wide response cache and quota scheduler shared by every client
+_cache = None
+_scheduler = None
+
+
+def _get_scheduler() -> QuotaScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _session_lock:
+            if _scheduler is None:
+                _scheduler = QuotaScheduler()
+    return _scheduler
+
+
+def _get_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _session_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def _get_session() -> requests.Session:
+    """Shared pooled session (connections are kept alive between requests)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
 class APISportsClient:
     """Client for interacting with API-Sports NBA API"""
     
     BASE_URL = "https://v2.nba.api-sports.io"
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Statuses worth retrying (rate limit and transient server errors)
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # (ttl, stale window) in seconds per endpoint; ttl None = immutable.
+    # Finished games and their box scores are promoted to immutable.
+    CACHE_POLICIES = {
+        "seasons": (7 * 86400, 7 * 86400),
+        "teams": (86400, 7 * 86400),
+        "players": (86400, 7 * 86400),
+        "standings": (3600, 86400),
+        "teams/statistics": (3600, 86400),
+        "players/statistics": (600, 86400),
+        "games": (300, 3600)
+    }
+    LIVE_POLICY = (10, 20)
+    IMMUTABLE = (None, None)
+    
+    # API-Sports game status codes (status.short): 2 = in play, 3 = finished
+    LIVE_STATUS = 2
+    FINISHED_STATUS = 3
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: Tuple[float, float] = (3.05, 10.0),
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        cache: Union[ResponseCache, bool] = True,
+        scheduler: Union[QuotaScheduler, bool] = True,
+        priority: int = QuotaScheduler.INTERACTIVE,
+        quota_timeout: Optional[float] = 30.0,
+        base_url: Optional[str] = None
+    ):
+        """
+        timeout: (connect, read) seconds per attempt
+        max_retries: retries after the first attempt on connection
+            errors, timeouts and RETRY_STATUSES
+        backoff / max_backoff: exponential backoff base and cap in
+            seconds (a Retry-After header takes precedence)
+        cache: a ResponseCache, True for the shared process-wide cache,
+            or False to always hit the API
+        scheduler: a QuotaScheduler, True for the shared process-wide
+            one, or False for no quota throttling
+        priority: QuotaScheduler.INTERACTIVE for user-facing lookups,
+            QuotaScheduler.BACKGROUND for backfills and ingestion
+        quota_timeout: longest wait for quota before APISportsError
+        base_url: API host (default $API_SPORTS_BASE_URL or BASE_URL),
+            e.g. a local ReplayServer
+        
+        With $API_SPORTS_RECORD_DIR set, every response is also saved
+        there for later replay (see utils.replay).
+        """
         self.api_key = api_key or os.environ.get("API_SPORTS_KEY")
         if not self.api_key:
             raise ValueError("API_SPORTS_KEY is required")
@@ -22,18 +147,223 @@ class APISportsClient:
             "x-rapidapi-key": self.api_key,
             "x-rapidapi-host": "v2.nba.api-sports.io"
         }
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.BASE_URL = (base_url or os.environ.get("API_SPORTS_BASE_URL") or self.BASE_URL).rstrip("/")
+        record_dir = os.environ.get("API_SPORTS_RECORD_DIR")
+        self.session = recording_session(record_dir) if record_dir else _get_session()
+        self.cache = _get_cache() if cache is True else (cache if isinstance(cache, ResponseCache) else None)
+        self.scheduler = _get_scheduler() if scheduler is True else (scheduler or None)
+        self.priority = priority
+        self.quota_timeout = quota_timeout
+        
+        # Calls recorded instead of sent while dry_run() is active
+        self._dry_run_calls = None
+        
+        # Cache keys with a background revalidation in flight
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        
+        # HTTP requests actually sent (cache hits excluded, retries included)
+        self.upstream_calls = 0
+        self._calls_lock = threading.Lock()
+    
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        policy: Optional[Tuple[Optional[float], Optional[float]]] = None,
+        fresh: bool = False
+    ) -> Dict:
+        """
+        Make a request to the API-Sports endpoint, through the cache
+        
+        policy: (ttl, stale window) overriding CACHE_POLICIES
+        fresh: skip the cache lookup (the new payload is still cached)
+        
+        A fresh cached payload is returned as is. A stale one inside its
+        stale window is returned immediately and refreshed in the
+        background (or returned if the refresh fails). Otherwise the API
+        is called and the payload cached. An IMMUTABLE request never
+        returns an entry that was cached with an expiry, since that
+        payload may predate the final data.
+        """
+        params = params or {}
+        policy = policy or self._cache_policy(endpoint, params)
+        
+        if self._dry_run_calls is not None:
+            entry = self.cache.get(self._cache_key(endpoint, params)) if self.cache and policy and not fresh else None
+            if entry is not None and entry.is_fresh() and not self._provisional(entry, policy):
+                return entry.data
+            self._dry_run_calls.append((endpoint, dict(params)))
+            return {"response": []}
+        
+        if self.cache is None or policy is None:
+            return self._fetch(endpoint, params)
+        
+        key = self._cache_key(endpoint, params)
+        entry = None if fresh else self.cache.get(key)
+        if entry is not None and self._provisional(entry, policy):
+            # Cached before the data was final (e.g. a box score read
+            # mid-game); refetch and store it as immutable
+            entry = None
+        if entry is not None:
+            if not entry.is_fresh():
+                self._revalidate(key, endpoint, params, policy)
+            return entry.data
+        
+        data = self._fetch(endpoint, params)
+        self._store(key, endpoint, data, policy)
+        return data
+    
+    def _provisional(self, entry, policy: Tuple) -> bool:
+        """True if an immutable payload is wanted but the entry was stored as expiring"""
+        return policy == self.IMMUTABLE and entry.expires_at is not None
+    
+    def _cache_policy(self, endpoint: str, params: Dict) -> Optional[Tuple]:
+        if endpoint == "games" and params.get("live"):
+            return self.LIVE_POLICY
+        return self.CACHE_POLICIES.get(endpoint)
+    
+    def _cache_key(self, endpoint: str, params: Dict) -> str:
+        return f"{self.BASE_URL}/{endpoint}?{json.dumps(params, sort_keys=True, default=str)}"
+    
+    def _store(self, key: str, endpoint: str, data: Dict, policy: Tuple):
+        """
+        Cache a payload; games responses made only of finished games
+        never expire, and ones with a game in progress expire like live games
+        """
+        if endpoint == "games":
+            games = data.get("response", [])
+            if self._all_finished(games):
+                policy = self.IMMUTABLE
+            elif any((game.get("status") or {}).get("short") == self.LIVE_STATUS for game in games):
+                policy = self.LIVE_POLICY
+        self.cache.set(key, data, *policy)
+    
+    def _all_finished(self, games: List[Dict]) -> bool:
+        return bool(games) and all(
+            (game.get("status") or {}).get("short") == self.FINISHED_STATUS for game in games
+        )
+    
+    def _revalidate(self, key: str, endpoint: str, params: Dict, policy: Tuple):
+        """Refresh a stale entry on a background thread (once per key)"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                data = self._fetch(endpoint, params, QuotaScheduler.BACKGROUND)
+                self._store(key, endpoint, data, policy)
+            except APISportsError as e:
+                print(f"Cache revalidation failed for {endpoint}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Make a request to the API-Sports endpoint"""
+    def _fetch(self, endpoint: str, params: Dict = None, priority: Optional[int] = None) -> Dict:
+        """
+        Call the API-Sports endpoint (no cache)
+        
+        Each attempt first takes quota from the scheduler at `priority`
+        (default: the client's). Retries transient failures with
+        exponential backoff; raises APISportsError once retries are
+        exhausted, on other HTTP errors, when quota runs out, or when
+        the API reports errors in its payload.
+        """
         url = f"{self.BASE_URL}/{endpoint}"
+        priority = self.priority if priority is None else priority
+        
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            if self.scheduler is not None:
+                try:
+                    self.scheduler.acquire(priority, timeout=self.quota_timeout)
+                except QuotaExhausted as e:
+                    raise APISportsError(str(e), endpoint, status=429) from e
+            with self._calls_lock:
+                self.upstream_calls += 1
+            try:
+                response = self.session.get(url, headers=self.headers, params=params or {}, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = APISportsError(f"API-Sports request failed: {e}", endpoint)
+            except requests.exceptions.RequestException as e:
+                raise APISportsError(f"API-Sports request failed: {e}", endpoint) from e
+            else:
+                if self.scheduler is not None:
+                    self.scheduler.update_from_headers(response.headers)
+                if response.status_code in self.RETRY_STATUSES:
+                    error = APISportsError(
+                        f"API-Sports returned {response.status_code} for {endpoint}",
+                        endpoint,
+                        status=response.status_code
+                    )
+                    retry_after = response.headers.get("Retry-After")
+                elif not response.ok:
+                    raise APISportsError(
+                        f"API-Sports returned {response.status_code} for {endpoint}",
+                        endpoint,
+                        status=response.status_code
+                    )
+                else:
+                    return self._parse_response(response, endpoint)
+            
+            if attempt == self.max_retries:
+                raise error
+            
+            delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+            if retry_after:
+                try:
+                    delay = min(float(retry_after), self.max_backoff)
+                except ValueError:
+                    pass
+            print(f"API request retry {attempt + 1}/{self.max_retries} in {delay:.2f}s: {error}")
+            if error.rate_limited and self.scheduler is not None:
+                # Hold every queued request, not just this one
+                self.scheduler.pause(delay)
+            time.sleep(delay)
+    
+    @staticmethod
+    def _parse_response(response: requests.Response, endpoint: str) -> Dict:
+        """Decode a 200 response; API-Sports reports some failures in its body"""
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise APISportsError(f"Invalid JSON from API-Sports for {endpoint}", endpoint, status=response.status_code) from e
+        
+        errors = data.get("errors")
+        if errors:
+            raise APISportsError(f"API-Sports error for {endpoint}: {errors}", endpoint, status=response.status_code, errors=errors)
+        return data
+    
+    def dry_run(self, job, *args, **kwargs) -> List[Tuple[str, Dict]]:
+        """
+        Run job(self, *args, **kwargs) without calling the API
         
+        Fresh cache hits are served as usual; every other request is
+        recorded and answered with an empty response. Returns the
+        (endpoint, params) calls the job would send. Calls that depend
+        on data the job would have fetched (e.g. per-game requests
+        after an uncached games lookup) are not visible here.
+        """
+        self._dry_run_calls = []
         try:
-            response = requests.get(url, headers=self.headers, params=params or {})
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API Request Error: {e}")
-            return {"response": [], "errors": str(e)}
+            job(self, *args, **kwargs)
+            return self._dry_run_calls
+        finally:
+            self._dry_run_calls = None
+    
+    def estimate(self, job, *args, **kwargs) -> Dict:
+        """Dry-run a job and estimate its quota use and duration"""
+        calls = self.dry_run(job, *args, **kwargs)
+        scheduler = self.scheduler or QuotaScheduler()
+        return dict(scheduler.estimate(len(calls), self.priority), requests=calls)
     
     # ============== PLAYERS ==============
     
@@ -78,9 +408,12 @@ class APISportsClient:
         data = self._make_request("games", {"team": team_id, "season": season})
         return data.get("response", [])
     
-    def get_live_games(self) -> List[Dict]:
-        """Get all currently live games"""
-        data = self._make_request("games", {"live": "all"})
+    def get_live_games(self, fresh: bool = False) -> List[Dict]:
+        """
+        Get all currently live games
+        fresh: bypass the short live cache (for pollers)
+        """
+        data = self._make_request("games", {"live": "all"}, fresh=fresh)
         return data.get("response", [])
     
     def get_game(self, game_id: int) -> Optional[Dict]:
@@ -112,9 +445,20 @@ class APISportsClient:
         
         return stats
     
-    def get_game_statistics(self, game_id: int) -> List[Dict]:
-        """Get all player statistics for a specific game"""
-        data = self._make_request("players/statistics", {"game": game_id})
+    def get_game_statistics(self, game_id: int, final: Optional[bool] = None, fresh: bool = False) -> List[Dict]:
+        """
+        Get all player statistics for a specific game
+        
+        final: whether the game is known to be finished; if None it is
+        looked up (cached) to decide whether the box score can be cached forever
+        fresh: bypass the cache for an in-progress box score
+        """
+        if final is None and self.cache is not None:
+            game = self.get_game(game_id)
+            final = bool(game) and self._all_finished([game])
+        # A finished game's box score never changes
+        policy = self.IMMUTABLE if final else None
+        data = self._make_request("players/statistics", {"game": game_id}, policy, fresh)
         return data.get("response", [])
     
     def get_team_statistics(self, team_id: int, season: int = 2024) -> Optional[Dict]:
@@ -148,78 +492,63 @@ class APISportsClient:
         Calculate season averages for a player
         Returns aggregated stats
         """
-        stats = self.get_player_statistics(player_id, season)
-        
-        if not stats:
-            return {}
+        return self._season_averages(self.get_player_statistics(player_id, season))
+    
+    @staticmethod
+    def _season_averages(stats: List[Dict]) -> Dict:
+        """Season averages from a player's per-game statistics rows"""
+        return season_averages(stats)
+    
+    def get_player_profile(self, player_id: int, season: int = 2024, last_n: int = 5) -> Optional[Dict]:
+        """
+        Player details, season averages and recent form in one call
         
-        # Initialize aggregators
-        totals = {
-            "games": 0,
-            "points": 0,
-            "rebounds": 0,
-            "assists": 0,
-            "steals": 0,
-            "blocks": 0,
-            "turnovers": 0,
-            "fgm": 0,
-            "fga": 0,
-            "tpm": 0,
-            "tpa": 0,
-            "ftm": 0,
-            "fta": 0,
-            "minutes": 0
-        }
+        The player and statistics requests run concurrently, and the
+        statistics are fetched once for both the averages and the form.
+        Returns None if the player does not exist.
+        """
+        from concurrent.futures import ThreadPoolExecutor
         
-        for game_stat in stats:
-            totals["games"] += 1
-            totals["points"] += game_stat.get("points", 0) or 0
-            totals["rebounds"] += (game_stat.get("totReb", 0) or 0)
-            totals["assists"] += game_stat.get("assists", 0) or 0
-            totals["steals"] += game_stat.get("steals", 0) or 0
-            totals["blocks"] += game_stat.get("blocks", 0) or 0
-            totals["turnovers"] += game_stat.get("turnovers", 0) or 0
-            totals["fgm"] += game_stat.get("fgm", 0) or 0
-            totals["fga"] += game_stat.get("fga", 0) or 0
-            totals["tpm"] += game_stat.get("tpm", 0) or 0
-            totals["tpa"] += game_stat.get("tpa", 0) or 0
-            totals["ftm"] += game_stat.get("ftm", 0) or 0
-            totals["fta"] += game_stat.get("fta", 0) or 0
-            
-            # Parse minutes (format: "32:45")
-            mins = game_stat.get("min", "0:0") or "0:0"
-            if ":" in str(mins):
-                m, s = str(mins).split(":")
-                totals["minutes"] += int(m) + int(s) / 60
-            else:
-                totals["minutes"] += float(mins) if mins else 0
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            player_future = pool.submit(self.get_player, player_id)
+            stats_future = pool.submit(self.get_player_statistics, player_id, season)
+            player = player_future.result()
+            stats = stats_future.result()
         
-        games = totals["games"]
-        if games == 0:
-            return {}
+        if not player:
+            return None
         
+        recent = sorted(stats, key=lambda x: x.get("game", {}).get("date", ""), reverse=True)[:last_n]
         return {
-            "games_played": games,
-            "ppg": round(totals["points"] / games, 1),
-            "rpg": round(totals["rebounds"] / games, 1),
-            "apg": round(totals["assists"] / games, 1),
-            "spg": round(totals["steals"] / games, 1),
-            "bpg": round(totals["blocks"] / games, 1),
-            "topg": round(totals["turnovers"] / games, 1),
-            "mpg": round(totals["minutes"] / games, 1),
-            "fg_pct": round(totals["fgm"] / totals["fga"] * 100, 1) if totals["fga"] > 0 else 0,
-            "three_pct": round(totals["tpm"] / totals["tpa"] * 100, 1) if totals["tpa"] > 0 else 0,
-            "ft_pct": round(totals["ftm"] / totals["fta"] * 100, 1) if totals["fta"] > 0 else 0,
-            "totals": totals
+            "player": player,
+            "season_stats": self._season_averages(stats),
+            "recent_form": self._recent_form(recent, last_n)
         }
     
+    def get_player_game_log(
+        self,
+        player_id: int,
+        season: int = 2024,
+        last_n_games: Optional[int] = None
+    ) -> GameLog:
+        """
+        Get a player's per-game stats as a columnar GameLog
+        Most recent game first; this is what NBAStatPredictor consumes
+        """
+        stats = self.get_player_statistics(player_id, season, last_n_games)
+        return GameLog.from_records(stats).sort_recent()
+    
     def get_player_recent_form(self, player_id: int, last_n: int = 5) -> Dict:
         """
         Get player's recent form (last N games)
         Useful for trend analysis
         """
         stats = self.get_player_statistics(player_id, last_n_games=last_n)
-        
+        return self._recent_form(stats, last_n)
+    
+    @staticmethod
+    def _recent_form(stats: List[Dict], last_n: int) -> Dict:
+        """Recent form from a player's last `last_n` statistics rows (most recent first)"""
         if not stats:
             return {"games": [], "trend": "unknown"}
         
@@ -0,0 +1,172 @@
+"""
+Async API-Sports Client for NBA Data
+Fans out API-Sports requests concurrently with a bounded number in flight
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
+
+from .api_sports import APISportsClient
+
+
+class AsyncAPISportsClient:
+    """
+    asyncio front end for APISportsClient
+
+    Every public APISportsClient method is available as a coroutine
+    (`await client.get_player(236)`). Calls run on worker threads over
+    the shared pooled session, so retries, timeouts and the response
+    cache behave as in the sync client. At most `max_concurrency`
+    requests are in flight at once.
+
+        async with AsyncAPISportsClient() as client:
+            stats = await client.get_roster_statistics(team_id=17)
+    """
+
+    # Enough workers to fetch a 15-player roster in one wave, and equal
+    # to the shared session's connection pool (pool_maxsize=16), so no
+    # connection is opened only to be discarded. Concurrency does not
+    # raise quota use: every request still passes the QuotaScheduler,
+    # which queues a burst past the per-minute budget instead of sending it.
+    DEFAULT_CONCURRENCY = 16
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        client: Optional[APISportsClient] = None,
+        **client_kwargs
+    ):
+        """
+        max_concurrency: upper bound on simultaneous upstream requests
+        client: an existing APISportsClient to wrap (otherwise one is
+            built from api_key and client_kwargs)
+        """
+        self.client = client or APISportsClient(api_key, **client_kwargs)
+        self.max_concurrency = max_concurrency
+
+        # Dedicated workers: the loop's default executor is sized by CPU
+        # count, which would cap concurrency on small serverless instances
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="api-sports")
+
+    async def __aenter__(self) -> "AsyncAPISportsClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """Release the worker threads"""
+        self._executor.shutdown(wait=False)
+
+    def __getattr__(self, name: str):
+        # Read through __dict__: if __init__ failed before setting
+        # client, self.client would re-enter __getattr__ forever
+        client = self.__dict__.get("client")
+        if client is None:
+            raise AttributeError(name)
+        attr = getattr(client, name)
+        if name.startswith("_") or not callable(attr):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self._run(attr, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    async def _run(self, fn, *args, **kwargs) -> Any:
+        """Run a blocking client call on one of the max_concurrency workers"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def gather(self, fn, keys: Iterable, *args, return_exceptions: bool = False, **kwargs) -> Dict:
+        """
+        Call fn(key, *args, **kwargs) for every key concurrently
+
+        Returns {key: result}. With return_exceptions=True a failed key
+        maps to its exception instead of failing the whole batch.
+        """
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(
+            *(self._run(fn, key, *args, **kwargs) for key in keys),
+            return_exceptions=return_exceptions
+        )
+        return dict(zip(keys, results))
+
+    # ============== FAN-OUT ==============
+
+    async def get_players_statistics(
+        self,
+        player_ids: Iterable[int],
+        season: int = 2024,
+        last_n_games: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> Dict[int, List[Dict]]:
+        """Per-game statistics for several players: {player_id: stats}"""
+        return await self.gather(
+            self.client.get_player_statistics, player_ids, season, last_n_games,
+            return_exceptions=return_exceptions
+        )
+
+    async def get_player_profiles(
+        self,
+        player_ids: Iterable[int],
+        season: int = 2024,
+        return_exceptions: bool = False
+    ) -> Dict[int, Optional[Dict]]:
+        """get_player_profile for several players: {player_id: profile}"""
+        return await self.gather(
+            self.client.get_player_profile, player_ids, season,
+            return_exceptions=return_exceptions
+        )
+
+    async def get_roster_statistics(
+        self,
+        team_id: int,
+        season: int = 2024,
+        last_n_games: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> Dict[int, Dict]:
+        """
+        A team's roster with each player's statistics fetched concurrently
+
+        Returns {player_id: {"player": ..., "statistics": [...]}}.
+        """
+        roster = await self._run(self.client.get_players_by_team, team_id, season)
+        players = {p["id"]: p for p in roster if p.get("id")}
+        stats = await self.get_players_statistics(
+            players, season, last_n_games, return_exceptions=return_exceptions
+        )
+        return {
+            player_id: {"player": player, "statistics": stats[player_id]}
+            for player_id, player in players.items()
+        }
+
+    async def get_games_statistics(
+        self,
+        game_ids: Iterable[int],
+        final: Optional[bool] = None,
+        return_exceptions: bool = False
+    ) -> Dict[int, List[Dict]]:
+        """Box scores for several games: {game_id: player statistics}"""
+        return await self.gather(
+            self.client.get_game_statistics, game_ids, final,
+            return_exceptions=return_exceptions
+        )
+
+    async def get_slate(self, date: str, return_exceptions: bool = False) -> List[Dict]:
+        """
+        All games on a date (YYYY-MM-DD) with their box scores fetched
+        concurrently; each game dict gets a "statistics" list
+        """
+        games = await self._run(self.client.get_games_by_date, date)
+        stats = await self.get_games_statistics(
+            [game["id"] for game in games if game.get("id")],
+            return_exceptions=return_exceptions
+        )
+        return [dict(game, statistics=stats.get(game.get("id"), [])) for game in games]
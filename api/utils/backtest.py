@@ -0,0 +1,208 @@
+"""
+Walk-Forward Backtesting for NBA Player Props
+Replays player_stats history through NBAStatPredictor and scores it
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Union
+
+from .ml_model import NBAStatPredictor
+from .training_data import build_training_data, season_of
+
+
+class Backtester:
+    """
+    Replays a season day by day and scores every historical line
+
+    Features for each game come from build_training_data, so they only
+    use games before that date. Each day's lines are scored per stat
+    type in one vectorized call, through the trained model or, with
+    use_model=False, the heuristic fallback.
+
+        report = Backtester(NBAStatPredictor()).run(player_stats, season=2023)
+        print(format_report(report))
+    """
+
+    CALIBRATION_BINS = 10
+
+    def __init__(self, predictor: Optional[NBAStatPredictor] = None, use_model: bool = True):
+        self.predictor = predictor or NBAStatPredictor()
+        self.use_model = use_model
+
+    def run(
+        self,
+        player_stats: Union[pd.DataFrame, List[Dict]],
+        season: Optional[int] = None,
+        stat_types: Optional[Sequence[str]] = None,
+        lines: Optional[pd.DataFrame] = None,
+        line_offsets: Sequence[float] = (-2.0, 0.0, 2.0),
+        min_prior_games: int = 3
+    ) -> Dict:
+        """
+        Backtest one season (default: the latest in player_stats)
+
+        lines: optional historical lines (player_id, game_date,
+            stat_type, line); without them, lines are synthesized
+            around each player's average at `line_offsets`
+
+        Returns a report: per-stat metrics, overall metrics and timing.
+        """
+        started = time.perf_counter()
+        stat_types = list(stat_types or NBAStatPredictor.STAT_TYPES)
+
+        features = build_training_data(
+            player_stats,
+            stat_types,
+            min_prior_games=min_prior_games,
+            line_offsets=line_offsets if lines is None else (0.0,)
+        )
+        feature_time = time.perf_counter() - started
+
+        scoring_time = 0.0
+        per_stat = {}
+        all_probs, all_hits = [], []
+
+        for stat in stat_types:
+            frame = features[stat]
+            if season is None and len(frame):
+                season = int(season_of(frame["game_date"]).max())
+            frame = frame[season_of(frame["game_date"]) == season]
+
+            if lines is not None:
+                frame = self._attach_lines(frame, lines, stat)
+            if frame.empty:
+                continue
+
+            frame = frame.sort_values("game_date", kind="stable")
+            X = frame[NBAStatPredictor.FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+            line_arr = frame["line"].to_numpy(dtype=np.float64)
+            day_codes, day_starts = np.unique(frame["game_date"].to_numpy(), return_index=True)
+            day_ends = np.append(day_starts[1:], len(frame))
+
+            # Walk forward one game day at a time
+            probs = np.empty(len(frame))
+            t0 = time.perf_counter()
+            for start, end in zip(day_starts, day_ends):
+                probs[start:end] = self._score(stat, line_arr[start:end], X[start:end])
+            scoring_time += time.perf_counter() - t0
+
+            probs /= 100
+            hits = frame["hit"].to_numpy(dtype=np.float64)
+            per_stat[stat] = self._metrics(probs, hits)
+            per_stat[stat]["days"] = len(day_codes)
+            all_probs.append(probs)
+            all_hits.append(hits)
+
+        total = sum(m["predictions"] for m in per_stat.values())
+        overall = (
+            self._metrics(np.concatenate(all_probs), np.concatenate(all_hits))
+            if all_probs else self._metrics(np.array([]), np.array([]))
+        )
+        elapsed = time.perf_counter() - started
+
+        return {
+            "season": season,
+            "mode": "ml" if self.use_model else "heuristic",
+            "stats": per_stat,
+            "overall": overall,
+            "timing": {
+                "predictions": total,
+                "feature_seconds": round(feature_time, 3),
+                "scoring_seconds": round(scoring_time, 3),
+                "total_seconds": round(elapsed, 3),
+                "predictions_per_sec": round(total / scoring_time, 1) if scoring_time else None,
+                "end_to_end_per_sec": round(total / elapsed, 1) if elapsed else None
+            }
+        }
+
+    def _score(self, stat: str, lines: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Over probability (0-100) for one day's rows"""
+        if self.use_model:
+            return self.predictor._score(stat, lines, X)
+        return self.predictor._heuristic_predict_batch(lines, X)
+
+    @staticmethod
+    def _attach_lines(frame: pd.DataFrame, lines: pd.DataFrame, stat: str) -> pd.DataFrame:
+        """Replace synthetic lines with the historical ones for this stat"""
+        stat_lines = lines[lines["stat_type"] == stat][["player_id", "game_date", "line"]]
+        stat_lines = stat_lines.assign(game_date=pd.to_datetime(stat_lines["game_date"]))
+        frame = frame.drop(columns=["line", "line_diff", "hit"]).merge(
+            stat_lines, on=["player_id", "game_date"], how="inner"
+        )
+        return frame.assign(
+            line_diff=frame["line"] - frame["season_avg"],
+            hit=(frame["actual"] > frame["line"]).astype(int)
+        )
+
+    @classmethod
+    def _metrics(cls, probs: np.ndarray, hits: np.ndarray) -> Dict:
+        """
+        Hit rate, Brier score and calibration for over probabilities
+
+        accuracy: picks the side with probability > 50% on every line
+        hit_rate: only lines the predictor calls (>= 65% or <= 35%)
+        """
+        n = len(probs)
+        if n == 0:
+            return {"predictions": 0, "accuracy": None, "hit_rate": None, "picks": 0,
+                    "brier_score": None, "calibration_error": None, "calibration": []}
+
+        picks_over = probs > 0.5
+        correct = picks_over == (hits > 0)
+        called = (probs >= 0.65) | (probs <= 0.35)
+
+        # Reliability table: mean predicted vs observed frequency per bin
+        bins = np.minimum((probs * cls.CALIBRATION_BINS).astype(int), cls.CALIBRATION_BINS - 1)
+        counts = np.bincount(bins, minlength=cls.CALIBRATION_BINS)
+        pred_sum = np.bincount(bins, weights=probs, minlength=cls.CALIBRATION_BINS)
+        hit_sum = np.bincount(bins, weights=hits, minlength=cls.CALIBRATION_BINS)
+
+        calibration = []
+        ece = 0.0
+        for b in np.flatnonzero(counts):
+            mean_pred = pred_sum[b] / counts[b]
+            observed = hit_sum[b] / counts[b]
+            ece += counts[b] / n * abs(mean_pred - observed)
+            calibration.append({
+                "bin": f"{b / cls.CALIBRATION_BINS:.1f}-{(b + 1) / cls.CALIBRATION_BINS:.1f}",
+                "count": int(counts[b]),
+                "mean_predicted": round(float(mean_pred), 4),
+                "observed": round(float(observed), 4)
+            })
+
+        return {
+            "predictions": n,
+            "accuracy": round(float(correct.mean()), 4),
+            "hit_rate": round(float(correct[called].mean()), 4) if called.any() else None,
+            "picks": int(called.sum()),
+            "over_rate": round(float(hits.mean()), 4),
+            "brier_score": round(float(np.mean((probs - hits) ** 2)), 4),
+            "calibration_error": round(float(ece), 4),
+            "calibration": calibration
+        }
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text summary of a backtest report"""
+    lines = [
+        f"Backtest season {report['season']} ({report['mode']})",
+        f"{'stat':<10}{'preds':>9}{'acc':>8}{'hit%':>8}{'picks':>8}{'brier':>8}{'ece':>8}"
+    ]
+    rows = list(report["stats"].items()) + [("overall", report["overall"])]
+    for stat, m in rows:
+        if not m["predictions"]:
+            continue
+        hit_rate = f"{m['hit_rate']:.3f}" if m["hit_rate"] is not None else "-"
+        lines.append(
+            f"{stat:<10}{m['predictions']:>9}{m['accuracy']:>8.3f}{hit_rate:>8}"
+            f"{m['picks']:>8}{m['brier_score']:>8.3f}{m['calibration_error']:>8.3f}"
+        )
+
+    timing = report["timing"]
+    lines.append(
+        f"{timing['predictions']} predictions in {timing['total_seconds']}s "
+        f"(scoring {timing['predictions_per_sec']}/s, end to end {timing['end_to_end_per_sec']}/s)"
+    )
+    return "\n".join(lines)
@@ -5,9 +5,11 @@ Adds contextual analysis and natural language explanations
 
 import os
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import anthropic
 
+from .game_log import GameLog
+
 
 class ClaudeReasoning:
     """
@@ -30,7 +32,7 @@ class ClaudeReasoning:
         line: float,
         ml_prediction: Dict,
         season_avg: Dict,
-        recent_games: List[Dict],
+        recent_games: Union[GameLog, List[Dict]],
         opponent: Optional[str] = None,
         additional_context: Optional[str] = None
     ) -> Dict:
@@ -82,7 +84,7 @@ class ClaudeReasoning:
         line: float,
         ml_prediction: Dict,
         season_avg: Dict,
-        recent_games: List[Dict],
+        recent_games: Union[GameLog, List[Dict]],
         opponent: Optional[str],
         additional_context: Optional[str]
     ) -> str:
@@ -90,7 +92,7 @@ class ClaudeReasoning:
         
         # Format recent games
         recent_games_str = ""
-        for i, game in enumerate(recent_games[:5], 1):
+        for i, game in enumerate(self._game_records(recent_games, 5), 1):
             pts = game.get("points", "N/A")
             reb = game.get("rebounds", "N/A")
             ast = game.get("assists", "N/A")
@@ -146,6 +148,11 @@ Respond ONLY with the JSON object, no other text."""
 
         return prompt
     
+    @staticmethod
+    def _game_records(recent_games: Union[GameLog, List[Dict]], n: int) -> List[Dict]:
+        """First n games as normalized dicts (consistent keys, numeric minutes)"""
+        return GameLog.coerce(recent_games[:n]).to_records()
+    
     def _parse_analysis(self, content: str, ml_prediction: Dict) -> Dict:
         """Parse Claude's response into structured data"""
         try:
@@ -204,7 +211,7 @@ Respond ONLY with the JSON object, no other text."""
         team: str,
         opponent: str,
         season_avg: Dict,
-        recent_games: List[Dict]
+        recent_games: Union[GameLog, List[Dict]]
     ) -> str:
         """Generate a natural language game preview"""
         
@@ -216,7 +223,7 @@ Season Stats:
 - {season_avg.get('ppg', 0)} PPG, {season_avg.get('rpg', 0)} RPG, {season_avg.get('apg', 0)} APG
 
 Recent form (last 3 games):
-{json.dumps(recent_games[:3], indent=2)}
+{json.dumps(self._game_records(recent_games, 3), indent=2)}
 
 Write a 2-3 sentence preview focusing on what to expect from this player tonight. Be specific and analytical, not generic."""
 
@@ -234,7 +241,7 @@ Write a 2-3 sentence preview focusing on what to expect from this player tonight
         self,
         player_name: str,
         season_avg: Dict,
-        recent_games: List[Dict],
+        recent_games: Union[GameLog, List[Dict]],
         available_lines: Dict[str, float]
     ) -> List[Dict]:
         """
@@ -255,7 +262,7 @@ Season Averages:
 - Minutes: {season_avg.get('mpg', 0)}
 
 Last 5 Games Performance:
-{json.dumps(recent_games[:5], indent=2)}
+{json.dumps(self._game_records(recent_games, 5), indent=2)}
 
 Available Betting Lines:
 {json.dumps(available_lines, indent=2)}
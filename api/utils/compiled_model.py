@@ -0,0 +1,206 @@
+"""
+Compiled Gradient-Boosting Models
+Flat NumPy tree evaluator for trained predictors (no sklearn at inference)
+"""
+
+import numpy as np
+
+
+class CompiledModel:
+    """
+    A binary (Hist)GradientBoostingClassifier plus its StandardScaler,
+    flattened into plain node arrays
+
+    All trees share one set of arrays (feature, threshold, left, right,
+    value); `roots` holds each tree's root node. Leaves point at
+    themselves, so evaluation is a fixed number of branch-free steps
+    over a (rows x trees) node matrix:
+
+        compiled = compile_model(model, scaler)
+        compiled.predict_proba(X)   # same as model.predict_proba(scaler.transform(X))
+    """
+
+    ARRAYS = (
+        "mean", "scale", "feature", "threshold", "left", "right",
+        "value", "roots", "params"
+    )
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        params: np.ndarray
+    ):
+        self.mean = mean
+        self.scale = scale
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        # [init raw score, learning rate, max depth, float32 inputs]
+        self.params = params
+
+    @property
+    def n_features(self) -> int:
+        return len(self.mean)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Raw log-odds score for each row"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+
+        init, learning_rate, max_depth = self.params[:3]
+        float32_inputs = self.params[3] if len(self.params) > 3 else 1.0
+
+        # sklearn's classic trees compare float32 inputs against float64
+        # thresholds; histogram trees compare float64 inputs
+        X_scaled = (X - self.mean) / self.scale
+        if float32_inputs:
+            X_scaled = X_scaled.astype(np.float32)
+
+        rows = np.arange(X_scaled.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X_scaled.shape[0], self.n_trees))
+
+        for _ in range(int(max_depth)):
+            go_left = X_scaled[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return init + learning_rate * self.value[nodes].sum(axis=1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities [P(miss), P(hit)] for each row"""
+        p_hit = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p_hit, p_hit])
+
+    # ============== PERSISTENCE ==============
+
+    def save(self, path: str):
+        """Save as an uncompressed .npz"""
+        with open(path, "wb") as f:
+            np.savez(f, **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        """
+        Load a compiled model saved with save(). The arrays are read into
+        memory: np.load cannot memory-map .npz members.
+        """
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls.ARRAYS})
+
+
+def compile_model(model, scaler, check_rows: int = 256, tolerance: float = 1e-6) -> CompiledModel:
+    """
+    Compile a fitted binary GradientBoostingClassifier or
+    HistGradientBoostingClassifier and its StandardScaler
+
+    Uses only fitted tree structures and scaler statistics, so the
+    result needs no sklearn to evaluate. The compiled output is checked
+    against model.predict_proba on `check_rows` synthetic rows around
+    the training distribution; a ValueError is raised if any
+    probability differs by more than `tolerance`.
+    """
+    if hasattr(model, "_predictors"):
+        # Histogram boosting: leaf values already include shrinkage and
+        # splits compare float64 inputs
+        if len(model._predictors[0]) != 1:
+            raise ValueError("Only binary gradient-boosting classifiers can be compiled")
+        trees = [_hist_tree(predictors[0].nodes) for predictors in model._predictors]
+        learning_rate, float32_inputs = 1.0, 0.0
+    else:
+        estimators = np.asarray(model.estimators_)
+        if estimators.ndim != 2 or estimators.shape[1] != 1:
+            raise ValueError("Only binary gradient-boosting classifiers can be compiled")
+        trees = [_sklearn_tree(estimator.tree_) for estimator in estimators[:, 0]]
+        learning_rate, float32_inputs = model.learning_rate, 1.0
+
+    n_features = model.n_features_in_
+    mean = np.zeros(n_features) if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.ones(n_features) if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for feature, threshold, left, right, value, depth in trees:
+        n = len(feature)
+        node_ids = np.arange(n)
+        is_leaf = left < 0
+
+        # Leaves point at themselves and test feature 0 against +inf
+        features.append(np.where(is_leaf, 0, feature).astype(np.int32))
+        thresholds.append(np.where(is_leaf, np.inf, threshold))
+        lefts.append((np.where(is_leaf, node_ids, left) + offset).astype(np.int32))
+        rights.append((np.where(is_leaf, node_ids, right) + offset).astype(np.int32))
+        values.append(value.astype(np.float64))
+        roots.append(offset)
+
+        max_depth = max(max_depth, depth)
+        offset += n
+
+    compiled = CompiledModel(
+        mean=mean,
+        scale=scale,
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts),
+        right=np.concatenate(rights),
+        value=np.concatenate(values),
+        roots=np.array(roots, dtype=np.int32),
+        params=np.array([0.0, learning_rate, max_depth, float32_inputs], dtype=np.float64)
+    )
+
+    # Recover the initial raw score (class prior) from a reference row
+    zero_row = mean.reshape(1, -1)
+    compiled.params[0] = model.decision_function(scaler.transform(zero_row))[0] - compiled.decision_function(zero_row)[0]
+
+    if check_rows:
+        rng = np.random.default_rng(0)
+        X_check = mean + scale * rng.normal(size=(check_rows, n_features)) * 2
+        expected = model.predict_proba(scaler.transform(X_check))[:, 1]
+        error = np.abs(compiled.predict_proba(X_check)[:, 1] - expected).max()
+        if error > tolerance:
+            raise ValueError(f"Compiled model differs from predict_proba by {error:.2e}")
+
+    return compiled
+
+
+def _sklearn_tree(tree):
+    """(feature, threshold, left, right, value, depth) of a sklearn Tree; leaves have left < 0"""
+    n = tree.node_count
+    return (
+        tree.feature,
+        tree.threshold,
+        tree.children_left,
+        tree.children_right,
+        tree.value.reshape(n, -1)[:, 0],
+        tree.max_depth
+    )
+
+
+def _hist_tree(nodes):
+    """(feature, threshold, left, right, value, depth) of a histogram-boosting predictor"""
+    is_leaf = nodes["is_leaf"].astype(bool)
+    if nodes["is_categorical"].any():
+        raise ValueError("Categorical splits cannot be compiled")
+    return (
+        nodes["feature_idx"],
+        nodes["num_threshold"],
+        np.where(is_leaf, -1, nodes["left"].astype(np.int64)),
+        np.where(is_leaf, -1, nodes["right"].astype(np.int64)),
+        nodes["value"],
+        int(nodes["depth"].max())
+    )
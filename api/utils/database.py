@@ -8,6 +8,8 @@ from typing import Optional, Dict, List
 from datetime import datetime, date
 from supabase import create_client, Client
 
+from .game_log import GameLog
+
 
 class SupabaseClient:
     """Client for interacting with Supabase database"""
@@ -42,6 +44,29 @@ class SupabaseClient:
         result = self.client.table("players").upsert(player_data).execute()
         return result.data[0] if result.data else None
     
+    def upsert_players(self, players: List[Dict], chunk_size: int = 500) -> int:
+        """Insert or update many players (only the given columns change)"""
+        for start in range(0, len(players), chunk_size):
+            self.client.table("players").upsert(players[start:start + chunk_size]).execute()
+        return len(players)
+    
+    def get_players(self, updated_since: Optional[str] = None, page_size: int = 1000) -> List[Dict]:
+        """
+        All players, or only those updated at or after `updated_since`
+        (an updated_at value); paged past the API's row limit
+        """
+        players = []
+        start = 0
+        while True:
+            query = self.client.table("players").select("*")
+            if updated_since:
+                query = query.gte("updated_at", updated_since)
+            result = query.order("id").range(start, start + page_size - 1).execute()
+            players.extend(result.data)
+            if len(result.data) < page_size:
+                return players
+            start += page_size
+    
     def get_players_by_team(self, team_id: int) -> List[Dict]:
         """Get all players on a team"""
         result = self.client.table("players")\
@@ -74,6 +99,82 @@ class SupabaseClient:
         result = query.execute()
         return result.data
     
+    def get_player_game_log(
+        self,
+        player_id: int,
+        limit: int = 10,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> GameLog:
+        """Get player's game stats as a columnar GameLog (most recent first)"""
+        return GameLog.from_records(self.get_player_stats(player_id, limit, start_date, end_date))
+    
+    def get_stats_for_players(
+        self,
+        player_ids: List[int],
+        start_date: Optional[date] = None,
+        page_size: int = 1000
+    ) -> List[Dict]:
+        """
+        Get all game stats for several players (optionally since a date),
+        oldest first; paged past the API's row limit
+        """
+        stats = []
+        start = 0
+        while True:
+            query = self.client.table("player_stats")\
+                .select("*")\
+                .in_("player_id", list(player_ids))
+            if start_date:
+                query = query.gte("game_date", start_date.isoformat())
+            # id breaks game_date ties so pages never overlap or skip rows
+            result = query.order("game_date").order("id").range(start, start + page_size - 1).execute()
+            stats.extend(result.data)
+            if len(result.data) < page_size:
+                return stats
+            start += page_size
+    
+    def get_recent_stats_for_players(
+        self,
+        player_ids: List[int],
+        last_n: int = 10,
+        before: Optional[date] = None
+    ) -> Dict[int, List[Dict]]:
+        """
+        Each player's last `last_n` games (optionally before a date) in
+        one query, most recent first: {player_id: [rows]}. Every
+        requested id is present, with [] if it has no games.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        grouped = {player_id: [] for player_id in player_ids}
+        if not player_ids:
+            return grouped
+        
+        result = self.client.rpc(
+            "get_recent_player_stats",
+            {
+                "p_player_ids": player_ids,
+                "p_last_n": last_n,
+                "p_before": before.isoformat() if before else None
+            }
+        ).execute()
+        
+        for row in result.data or []:
+            grouped.setdefault(row["player_id"], []).append(row)
+        return grouped
+    
+    def get_game_logs_for_players(
+        self,
+        player_ids: List[int],
+        last_n: int = 10,
+        before: Optional[date] = None
+    ) -> Dict[int, GameLog]:
+        """get_recent_stats_for_players as columnar GameLogs (most recent first)"""
+        return {
+            player_id: GameLog.from_records(rows)
+            for player_id, rows in self.get_recent_stats_for_players(player_ids, last_n, before).items()
+        }
+    
     def insert_player_stats(self, stats: Dict) -> Dict:
         """Insert player game stats"""
         result = self.client.table("player_stats").insert(stats).execute()
@@ -84,6 +185,20 @@ class SupabaseClient:
         result = self.client.table("player_stats").insert(stats_list).execute()
         return result.data
     
+    def upsert_player_stats(self, stats_list: List[Dict], chunk_size: int = 500) -> int:
+        """
+        Insert or update per-game stats on (player_id, game_id), in
+        chunks of `chunk_size` rows per request. Returns rows written.
+        """
+        written = 0
+        for start in range(0, len(stats_list), chunk_size):
+            chunk = stats_list[start:start + chunk_size]
+            self.client.table("player_stats")\
+                .upsert(chunk, on_conflict="player_id,game_id")\
+                .execute()
+            written += len(chunk)
+        return written
+    
     # ============== SEASON AVERAGES ==============
     
     def get_season_averages(self, player_id: int, season: int = 2024) -> Optional[Dict]:
@@ -135,6 +250,24 @@ class SupabaseClient:
         result = query.execute()
         return result.data
     
+    def get_settled_predictions(
+        self,
+        since: Optional[str] = None,
+        limit: int = 5000
+    ) -> List[Dict]:
+        """Get predictions settled after a timestamp (oldest first)"""
+        query = self.client.table("predictions")\
+            .select("*")\
+            .not_.is_("settled_at", "null")\
+            .order("settled_at")
+        
+        if since:
+            query = query.gt("settled_at", since)
+        
+        query = query.limit(limit)
+        result = query.execute()
+        return result.data
+    
     def settle_prediction(self, prediction_id: int, actual_value: float) -> Dict:
         """Settle a prediction with actual result"""
         # First get the prediction to determine if it hit
@@ -167,6 +300,20 @@ class SupabaseClient:
         
         return result.data[0] if result.data else None
     
+    def settle_predictions(self, game_date: date) -> Dict:
+        """
+        Settle every open prediction for a game date from player_stats
+        in one database call (the settle_predictions function)
+        """
+        result = self.client.rpc(
+            "settle_predictions",
+            {"p_game_date": game_date.isoformat()}
+        ).execute()
+        
+        if result.data:
+            return result.data[0]
+        return {"settled": 0, "hits": 0, "still_open": 0}
+    
     def get_prediction_accuracy(
         self, 
         stat_type: Optional[str] = None,
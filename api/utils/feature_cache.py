@@ -0,0 +1,308 @@
+"""
+Rolling Feature Cache for NBA Player Props
+Per-player running window state so features never rescan the game log
+"""
+
+import sys
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+from datetime import date
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .game_log import GameLog
+from .ml_model import NBAStatPredictor
+
+
+class _Rolling:
+    """
+    Running statistics over the last `window` values of one stat
+
+    Keeps sums for the last 3/5/window values, the sum of squares over
+    the window and monotonic deques for the window max/min, so each
+    push is O(1) (amortized for the deques).
+    """
+
+    __slots__ = ("window", "values", "seq", "sum3", "sum5", "sum_w", "sumsq_w",
+                 "max_q", "min_q", "season_sum", "season_count")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.seq = 0
+        self.sum3 = self.sum5 = self.sum_w = self.sumsq_w = 0.0
+        self.max_q = deque()
+        self.min_q = deque()
+        self.season_sum = 0.0
+        self.season_count = 0
+
+    def push(self, value: float):
+        values = self.values
+        n = len(values)
+
+        # Values leaving the 3/5/window sums (values[-k] is k games back)
+        if n >= 3:
+            self.sum3 -= values[-3]
+        if n >= 5:
+            self.sum5 -= values[-5]
+        if n >= self.window:
+            old = values[0]
+            self.sum_w -= old
+            self.sumsq_w -= old * old
+
+        values.append(value)
+        self.sum3 += value
+        self.sum5 += value
+        self.sum_w += value
+        self.sumsq_w += value * value
+        self.season_sum += value
+        self.season_count += 1
+
+        seq = self.seq
+        self.seq += 1
+        expired = seq - self.window
+        for q, better in ((self.max_q, value.__ge__), (self.min_q, value.__le__)):
+            while q and better(q[-1][1]):
+                q.pop()
+            q.append((seq, value))
+            if q[0][0] <= expired:
+                q.popleft()
+
+    def features(self, season_val: Optional[float]) -> tuple:
+        """(season, last 5, last 3, max, min, std) as prepare_features computes them"""
+        n = len(self.values)
+        if season_val is None:
+            season_val = self.season_sum / self.season_count if self.season_count else 0.0
+        if n == 0:
+            return season_val, season_val, season_val, season_val, season_val, 0.0
+
+        mean_w = self.sum_w / n
+        var = self.sumsq_w / n - mean_w * mean_w
+        return (
+            season_val,
+            self.sum5 / min(n, 5),
+            self.sum3 / min(n, 3),
+            self.max_q[0][1],
+            self.min_q[0][1],
+            float(np.sqrt(max(var, 0.0))) if n > 1 else 0.0
+        )
+
+
+class _PlayerState:
+    """Rolling state for every stat type plus minutes for one player-season"""
+
+    __slots__ = ("season", "last_date", "rolling")
+
+    def __init__(self, season: Optional[int], window: int):
+        self.season = season
+        self.last_date: Optional[date] = None
+        self.rolling = {key: _Rolling(window) for key in FeatureCache.TRACKED}
+
+
+@lru_cache(maxsize=None)
+def _state_bytes(window: int) -> int:
+    """
+    Memory held by one player's state once its windows are full,
+    measured with sys.getsizeof over a populated _PlayerState
+    """
+    state = _PlayerState(None, window)
+    for i in range(window + 5):
+        for rolling in state.rolling.values():
+            rolling.push(float(i % 7) + 0.5)
+    return _deep_sizeof(state, set())
+
+
+def _deep_sizeof(obj, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, deque)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    for name in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, name):
+            size += _deep_sizeof(getattr(obj, name), seen)
+    return size
+
+
+class FeatureCache:
+    """
+    LRU cache of per-player rolling-window state, keyed by player id
+
+    Finished games are appended in date order with append()/extend();
+    each append updates the 3/5/10-game sums, sums of squares and
+    min/max deques in O(1). features() then serves the latest feature
+    vector (same layout as NBAStatPredictor.prepare_features, window =
+    last `window` games this season) without touching the raw log.
+
+    Least recently used players are evicted once the estimated state
+    size (players x state_bytes, measured for this window) exceeds
+    `max_bytes`.
+
+        cache = FeatureCache()
+        cache.extend(player_id, client.get_player_game_log(player_id)[::-1])
+        cache.features(player_id, "points", opponent_def_rating=112.5)
+    """
+
+    # Game log columns tracked per player (pra is derived on append)
+    TRACKED = ("points", "rebounds", "assists", "threes", "steals", "blocks", "pra", "minutes")
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, window: int = 10):
+        self.max_bytes = max_bytes
+        self.window = window
+        self.state_bytes = _state_bytes(window)
+        self._states: "OrderedDict[int, _PlayerState]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._states
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by cached player state"""
+        return len(self._states) * self.state_bytes
+
+    # ============== UPDATES ==============
+
+    def append(self, player_id: int, game: Dict, game_date: Optional[Union[date, str]] = None) -> bool:
+        """
+        Append one finished game (API-Sports, player_stats or recent-form
+        dict). Games at or before the player's last cached date are
+        ignored, so replaying a day is harmless. Returns True if applied.
+        """
+        log = GameLog.from_records([game])
+        if game_date is not None:
+            log.dates[0] = np.datetime64(str(game_date)[:10], "D")
+        return self.extend(player_id, log) > 0
+
+    def extend(self, player_id: int, games: Union[GameLog, List[Dict]]) -> int:
+        """Append games in chronological order (oldest first); returns how many applied"""
+        log = GameLog.coerce(games)
+        if not len(log):
+            return 0
+
+        columns = {key: log[key].tolist() for key in ("points", "rebounds", "assists", "threes",
+                                                     "steals", "blocks", "minutes")}
+        applied = 0
+
+        with self._lock:
+            state = self._states.get(player_id)
+            for i in range(len(log)):
+                game_date = None if np.isnat(log.dates[i]) else log.dates[i].astype(date)
+                season = _season(game_date)
+
+                if state is None or (season is not None and state.season is not None and season > state.season):
+                    # New player or new season: rolling windows restart
+                    state = _PlayerState(season, self.window)
+                    self._states[player_id] = state
+                elif game_date and state.last_date and game_date <= state.last_date:
+                    continue
+
+                row = {key: col[i] for key, col in columns.items()}
+                row["pra"] = row["points"] + row["rebounds"] + row["assists"]
+                for key, rolling in state.rolling.items():
+                    rolling.push(row[key])
+
+                state.season = state.season if season is None else season
+                state.last_date = game_date or state.last_date
+                applied += 1
+
+            if state is not None:
+                self._states.move_to_end(player_id)
+                self._evict()
+
+        return applied
+
+    def warm(self, player_ids: List[int], db=None, last_n: int = 82) -> int:
+        """
+        Load every uncached player in a slate from player_stats with one
+        batched query (their last `last_n` games); returns players loaded
+        """
+        with self._lock:
+            missing = [player_id for player_id in dict.fromkeys(player_ids) if player_id not in self._states]
+        if not missing:
+            return 0
+        if db is None:
+            from .database import get_db
+            db = get_db()
+
+        logs = db.get_game_logs_for_players(missing, last_n)
+        for player_id, log in logs.items():
+            self.extend(player_id, log[::-1])
+        return sum(1 for log in logs.values() if len(log))
+
+    def invalidate(self, player_id: int):
+        """Drop a player's state (e.g. after a stat correction)"""
+        with self._lock:
+            self._states.pop(player_id, None)
+
+    def _evict(self):
+        """Drop least recently used players until under the memory cap"""
+        while self._states and self.nbytes > self.max_bytes:
+            self._states.popitem(last=False)
+
+    # ============== FEATURES ==============
+
+    def last_game_date(self, player_id: int) -> Optional[date]:
+        state = self._states.get(player_id)
+        return state.last_date if state else None
+
+    def features(
+        self,
+        player_id: int,
+        stat_type: str,
+        season_avg: Optional[Dict] = None,
+        opponent_def_rating: float = 110.0,
+        is_home: bool = True,
+        rest_days: Optional[int] = None,
+        game_date: Optional[Union[date, str]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Latest feature vector for a player's stat, or None if not cached
+
+        season_avg: API season averages (ppg, rpg, ...); defaults to the
+            cache's own running season mean
+        rest_days: defaults to the days between the last cached game and
+            `game_date` (1 if neither is known)
+        """
+        if stat_type not in NBAStatPredictor.STAT_KEYS:
+            raise ValueError(f"Unknown stat type: {stat_type}")
+
+        with self._lock:
+            state = self._states.get(player_id)
+            if state is None:
+                return None
+            self._states.move_to_end(player_id)
+
+            season_val = None
+            if season_avg:
+                season_val = sum(season_avg.get(k, 0) for k in NBAStatPredictor.AVG_KEYS[stat_type])
+            stat_features = state.rolling[stat_type].features(season_val)
+
+            minutes = state.rolling["minutes"]
+            n_minutes = len(minutes.values)
+            minutes_avg = minutes.sum_w / n_minutes if n_minutes else (season_avg or {}).get("mpg", 30)
+
+            if rest_days is None:
+                rest_days = 1
+                if game_date is not None and state.last_date is not None:
+                    game_day = date.fromisoformat(str(game_date)[:10])
+                    rest_days = max((game_day - state.last_date).days - 1, 0)
+
+        return NBAStatPredictor._feature_vector(
+            *stat_features, minutes_avg, opponent_def_rating, is_home, rest_days
+        )
+
+
+def _season(game_date: Optional[date]) -> Optional[int]:
+    """NBA season (start year) of a game date: Oct-Dec belong to that year's season"""
+    if game_date is None:
+        return None
+    return game_date.year if game_date.month >= 10 else game_date.year - 1
@@ -0,0 +1,234 @@
+"""
+Columnar Game Log for NBA Player Stats
+Compact, array-backed per-game stats normalized from any of our sources
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Union, Iterable
+
+
+def parse_minutes(value) -> float:
+    """Parse minutes played ("32:45", "32", 32, None) into float minutes"""
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    value = str(value)
+    try:
+        if ":" in value:
+            m, s = value.split(":", 1)
+            return int(m or 0) + int(s or 0) / 60
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def parse_minutes_array(values) -> np.ndarray:
+    """
+    Vectorized parse_minutes over a sequence of raw minutes values
+    ("32:45", "32", numbers, None); invalid entries are 0
+    """
+    raw = np.asarray([("" if v is None else str(v)) for v in values], dtype=str)
+    if raw.size == 0:
+        return np.zeros(0)
+    
+    mins, sep, secs = np.char.partition(raw, ":").T
+    result = np.zeros(raw.size)
+    for part, scale in ((mins, 1.0), (secs, 1 / 60)):
+        part = np.char.strip(part)
+        numeric = np.char.isdigit(np.char.replace(part, ".", "", count=1))
+        result[numeric] += part[numeric].astype(np.float64) * scale
+    
+    # Anything else unparseable (e.g. "-5", "1e2", "DNP") goes through the scalar parser
+    odd = (np.char.str_len(raw) > 0) & ~(
+        np.char.isdigit(np.char.replace(np.char.replace(raw, ":", "", count=1), ".", "", count=1))
+    )
+    for i in np.flatnonzero(odd):
+        result[i] = parse_minutes(values[i])
+    return result
+
+
+def _to_float(value) -> float:
+    """Convert a raw stat value to float (missing or invalid = 0)"""
+    if value is None or value == "":
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class GameLog:
+    """
+    A player's game log stored as fixed-dtype NumPy columns
+
+    Rows are normalized once from API-Sports `players/statistics`
+    responses, `player_stats` table rows or plain recent-game dicts.
+    Row order is preserved (use sort_recent() for most recent first).
+
+    Stat columns share one float32 block, column-major so each column
+    is a contiguous view:
+
+        log = GameLog.from_records(api_stats).sort_recent()
+        log["points"][:5]
+    """
+
+    FIELDS = (
+        "points", "rebounds", "assists", "threes", "steals", "blocks",
+        "turnovers", "minutes", "fgm", "fga", "tpa", "ftm", "fta", "plus_minus"
+    )
+
+    # Source keys tried in order for each field
+    # (API-Sports uses totReb / tpm / min / plusMinus)
+    FIELD_SOURCES = {
+        "points": ("points",),
+        "rebounds": ("rebounds", "totReb"),
+        "assists": ("assists",),
+        "threes": ("threes", "tpm"),
+        "steals": ("steals",),
+        "blocks": ("blocks",),
+        "turnovers": ("turnovers",),
+        "minutes": ("minutes", "min"),
+        "fgm": ("fgm",),
+        "fga": ("fga",),
+        "tpa": ("tpa",),
+        "ftm": ("ftm",),
+        "fta": ("fta",),
+        "plus_minus": ("plus_minus", "plusMinus")
+    }
+
+    _INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+    __slots__ = ("game_ids", "dates", "values")
+
+    def __init__(
+        self,
+        values: Optional[np.ndarray] = None,
+        game_ids: Optional[np.ndarray] = None,
+        dates: Optional[np.ndarray] = None
+    ):
+        if values is None:
+            values = np.zeros((0, len(self.FIELDS)), dtype=np.float32, order="F")
+        n = values.shape[0]
+
+        self.values = values
+        self.game_ids = game_ids if game_ids is not None else np.zeros(n, dtype=np.int64)
+        self.dates = dates if dates is not None else np.full(n, "NaT", dtype="datetime64[D]")
+
+    # ============== CONSTRUCTION ==============
+
+    @classmethod
+    def from_records(cls, records: Optional[Iterable[Dict]]) -> "GameLog":
+        """
+        Build a game log from per-game dicts
+
+        Accepts API-Sports statistics rows, `player_stats` rows and
+        recent-form dicts; keys are normalized via FIELD_SOURCES.
+        """
+        records = list(records or [])
+        n = len(records)
+
+        values = np.zeros((n, len(cls.FIELDS)), dtype=np.float32, order="F")
+        game_ids = np.zeros(n, dtype=np.int64)
+        dates = np.full(n, "NaT", dtype="datetime64[D]")
+        sources = [
+            (j, cls.FIELD_SOURCES[name], parse_minutes if name == "minutes" else _to_float)
+            for j, name in enumerate(cls.FIELDS)
+        ]
+
+        for i, row in enumerate(records):
+            for j, keys, convert in sources:
+                for key in keys:
+                    val = row.get(key)
+                    if val is not None:
+                        values[i, j] = convert(val)
+                        break
+
+            game = row.get("game") if isinstance(row.get("game"), dict) else {}
+            game_id = row.get("game_id") or game.get("id")
+            if game_id:
+                game_ids[i] = int(game_id)
+
+            date = row.get("game_date") or row.get("date") or game.get("date")
+            if isinstance(date, dict):
+                date = date.get("start")
+            if date:
+                try:
+                    dates[i] = np.datetime64(str(date)[:10], "D")
+                except ValueError:
+                    pass
+
+        return cls(values, game_ids, dates)
+
+    @classmethod
+    def coerce(cls, games: Union["GameLog", List[Dict], None]) -> "GameLog":
+        """Return `games` as a GameLog, normalizing dict rows if needed"""
+        if isinstance(games, cls):
+            return games
+        return cls.from_records(games)
+
+    # ============== ACCESS ==============
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, key):
+        """log["points"] -> column, log[:5] -> GameLog, log[0] -> dict"""
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+        return self.take([key]).to_records()[0]
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a stat column (float32 view)"""
+        if name not in self._INDEX:
+            raise KeyError(f"Unknown game log field: {name}")
+        return self.values[:, self._INDEX[name]]
+
+    def take(self, indices) -> "GameLog":
+        """Get a new GameLog with the given rows"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return GameLog(
+            np.asfortranarray(self.values[indices]),
+            self.game_ids[indices],
+            self.dates[indices]
+        )
+
+    def head(self, n: int) -> "GameLog":
+        """First n games"""
+        return self[:n]
+
+    def sort_recent(self) -> "GameLog":
+        """Sort games by date, most recent first (undated games last)"""
+        keys = np.where(
+            np.isnat(self.dates),
+            np.iinfo(np.int64).max,
+            -self.dates.astype(np.int64)
+        )
+        return self.take(np.argsort(keys, kind="stable"))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays"""
+        return self.values.nbytes + self.game_ids.nbytes + self.dates.nbytes
+
+    def to_records(self) -> List[Dict]:
+        """
+        Convert back to a list of normalized per-game dicts
+        Whole-number stats come back as ints, minutes to one decimal
+        """
+        records = []
+        for i, row in enumerate(self.values.tolist()):
+            record = {
+                name: int(value) if value.is_integer() else round(value, 1)
+                for name, value in zip(self.FIELDS, row)
+            }
+            record["game_id"] = int(self.game_ids[i]) or None
+            record["date"] = None if np.isnat(self.dates[i]) else str(self.dates[i])
+            records.append(record)
+        return records
+
+    def __repr__(self) -> str:
+        return f"GameLog(games={len(self)})"
@@ -0,0 +1,257 @@
+"""
+Game-Day Ingestion for NBA Player Stats
+Pulls a day's box scores from API-Sports into the player_stats table
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from .api_sports import APISportsClient
+from .async_api_sports import AsyncAPISportsClient
+from .game_log import parse_minutes
+from .quota import QuotaScheduler
+
+try:
+    from zoneinfo import ZoneInfo
+    _EASTERN = ZoneInfo("America/New_York")
+except Exception:
+    _EASTERN = None
+
+
+class GameDayIngestor:
+    """
+    Loads every finished game on a date into player_stats
+
+    One games lookup plus one box-score request per game (fetched
+    concurrently) replaces a statistics request per player. Rows are
+    normalized to the player_stats schema and bulk-upserted on
+    (player_id, game_id), so re-running a date is idempotent.
+
+        ingestor = GameDayIngestor()
+        ingestor.ingest_date("2024-12-25")
+    """
+
+    def __init__(
+        self,
+        client: Optional[APISportsClient] = None,
+        db=None,
+        chunk_size: int = 500,
+        max_concurrency: int = 4
+    ):
+        """
+        client: API-Sports client (default: a background-priority one,
+            so ingestion yields quota to user-facing lookups)
+        db: SupabaseClient (default: get_db())
+        """
+        self.client = client or APISportsClient(priority=QuotaScheduler.BACKGROUND)
+        if db is None:
+            from .database import get_db
+            db = get_db()
+        self.db = db
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+
+    # ============== INGESTION ==============
+
+    def ingest_date(self, game_date: Union[date, str], finished_only: bool = True, settle: bool = True) -> Dict:
+        """
+        Ingest one NBA game date (US Eastern, the date games are billed on)
+
+        API-Sports dates games in UTC, so late tip-offs fall on the next
+        UTC day; both UTC days are looked up and filtered to `game_date`.
+        With `settle`, open predictions for the date are then settled
+        against the new box scores in one database call.
+        Returns a report with game, row and upstream call counts (HTTP
+        requests the client actually sent; cache hits are free).
+        """
+        started = time.perf_counter()
+        calls_before = self.client.upstream_calls
+        game_date = _as_date(game_date)
+
+        games = self._games_on(game_date)
+        if finished_only:
+            games = [g for g in games if _status(g) == APISportsClient.FINISHED_STATUS]
+
+        slate = self._box_scores(games)
+        players, rows = normalize_slate(slate, game_date)
+
+        if rows:
+            self.db.upsert_players(players, self.chunk_size)
+            self.db.upsert_player_stats(rows, self.chunk_size)
+
+        # Partial box scores of games in progress must not settle anything
+        settlement = None
+        if settle and finished_only and rows:
+            settlement = self.db.settle_predictions(game_date)
+
+        report = {
+            "date": game_date.isoformat(),
+            "games": len(games),
+            "players": len(players),
+            "rows": len(rows),
+            "settlement": settlement,
+            "upstream_calls": self.client.upstream_calls - calls_before,
+            "seconds": round(time.perf_counter() - started, 2)
+        }
+        print(f"Ingested {report['rows']} player_stats rows from {report['games']} games on {report['date']}")
+        return report
+
+    def ingest_range(self, start: Union[date, str], end: Union[date, str], **kwargs) -> List[Dict]:
+        """Ingest every date from start to end inclusive"""
+        day, end = _as_date(start), _as_date(end)
+        reports = []
+        while day <= end:
+            reports.append(self.ingest_date(day, **kwargs))
+            day += timedelta(days=1)
+        return reports
+
+    def estimate(self, game_date: Union[date, str]) -> Dict:
+        """
+        Quota estimate for ingesting a date without fetching box scores:
+        the games lookups (served from cache when possible) plus one
+        request per finished game
+        """
+        game_date = _as_date(game_date)
+        games = [g for g in self._games_on(game_date) if _status(g) == APISportsClient.FINISHED_STATUS]
+        scheduler = self.client.scheduler or QuotaScheduler()
+        return dict(scheduler.estimate(len(games), self.client.priority), games=len(games))
+
+    def _games_on(self, game_date: date) -> List[Dict]:
+        """Games whose Eastern-time date is game_date"""
+        games = {}
+        for day in (game_date, game_date + timedelta(days=1)):
+            for game in self.client.get_games_by_date(day.isoformat()):
+                if _local_date(game) == game_date:
+                    games[game["id"]] = game
+        return list(games.values())
+
+    def _box_scores(self, games: List[Dict]) -> List[Dict]:
+        """Each game with its player statistics, fetched concurrently"""
+        if not games:
+            return []
+
+        async def fetch(game_ids: List[int], final: bool):
+            async with AsyncAPISportsClient(client=self.client, max_concurrency=self.max_concurrency) as client:
+                return await client.get_games_statistics(game_ids, final)
+
+        # Status is already known, so no per-game lookup is needed
+        finished = [g["id"] for g in games if _status(g) == APISportsClient.FINISHED_STATUS]
+        unfinished = [g["id"] for g in games if _status(g) != APISportsClient.FINISHED_STATUS]
+        stats = asyncio.run(fetch(finished, True)) if finished else {}
+        if unfinished:
+            stats.update(asyncio.run(fetch(unfinished, False)))
+        return [dict(game, statistics=stats.get(game["id"], [])) for game in games]
+
+
+def normalize_slate(slate: List[Dict], game_date: date) -> Tuple[List[Dict], List[Dict]]:
+    """
+    (players rows, player_stats rows) for games with their "statistics"
+
+    Players who did not play are skipped; duplicate (player, game)
+    rows keep the last one, since one upsert may not touch a row twice.
+    """
+    players, rows = {}, {}
+    for game in slate:
+        teams = game.get("teams") or {}
+        home_id = (teams.get("home") or {}).get("id")
+        away_id = (teams.get("visitors") or {}).get("id")
+
+        for stat in game.get("statistics", []):
+            row = normalize_stat_row(stat, game["id"], game_date, home_id, away_id)
+            if row is None:
+                continue
+            rows[(row["player_id"], row["game_id"])] = row
+
+            player = stat.get("player") or {}
+            team = stat.get("team") or {}
+            players[row["player_id"]] = {
+                "id": row["player_id"],
+                "first_name": player.get("firstname"),
+                "last_name": player.get("lastname"),
+                "team_id": team.get("id"),
+                "team_name": team.get("name")
+            }
+    return list(players.values()), list(rows.values())
+
+
+def normalize_stat_row(
+    stat: Dict,
+    game_id: int,
+    game_date: date,
+    home_id: Optional[int],
+    away_id: Optional[int]
+) -> Optional[Dict]:
+    """One API-Sports players/statistics row as a player_stats row (None if DNP)"""
+    player_id = (stat.get("player") or {}).get("id")
+    if not player_id:
+        return None
+
+    minutes = parse_minutes(stat.get("min"))
+    if minutes == 0 and not _int(stat.get("points")) and not _int(stat.get("totReb")):
+        return None
+
+    team_id = (stat.get("team") or {}).get("id")
+    is_home = team_id == home_id if home_id is not None else True
+    return {
+        "player_id": player_id,
+        "game_id": game_id,
+        "game_date": game_date.isoformat(),
+        "opponent_id": away_id if is_home else home_id,
+        "is_home": is_home,
+        "minutes": int(round(minutes)),
+        "points": _int(stat.get("points")),
+        "rebounds": _int(stat.get("totReb")),
+        "offensive_rebounds": _int(stat.get("offReb")),
+        "defensive_rebounds": _int(stat.get("defReb")),
+        "assists": _int(stat.get("assists")),
+        "steals": _int(stat.get("steals")),
+        "blocks": _int(stat.get("blocks")),
+        "turnovers": _int(stat.get("turnovers")),
+        "personal_fouls": _int(stat.get("pFouls")),
+        "fgm": _int(stat.get("fgm")),
+        "fga": _int(stat.get("fga")),
+        "fg_pct": _pct(stat.get("fgp")),
+        "tpm": _int(stat.get("tpm")),
+        "tpa": _int(stat.get("tpa")),
+        "tp_pct": _pct(stat.get("tpp")),
+        "ftm": _int(stat.get("ftm")),
+        "fta": _int(stat.get("fta")),
+        "ft_pct": _pct(stat.get("ftp")),
+        "plus_minus": _int(stat.get("plusMinus"))
+    }
+
+
+def _int(value) -> int:
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _pct(value) -> Optional[float]:
+    try:
+        return round(float(value), 2)
+    except (TypeError, ValueError):
+        return None
+
+
+def _status(game: Dict) -> Optional[int]:
+    return (game.get("status") or {}).get("short")
+
+
+def _as_date(value: Union[date, str]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _local_date(game: Dict) -> Optional[date]:
+    """A game's tip-off date in US Eastern time"""
+    start = (game.get("date") or {}).get("start")
+    if not start:
+        return None
+    tipoff = datetime.fromisoformat(start.replace("Z", "+00:00"))
+    if _EASTERN is not None and tipoff.tzinfo is not None:
+        tipoff = tipoff.astimezone(_EASTERN)
+    return tipoff.date()
+
@@ -0,0 +1,279 @@
+"""
+Live Box-Score Poller for NBA Games
+Polls in-progress games and emits only the stat lines that changed
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .api_sports import APISportsClient, APISportsError
+from .async_api_sports import AsyncAPISportsClient
+from .ingestion import normalize_stat_row, _local_date
+
+
+class LiveBoxScorePoller:
+    """
+    Turns repeated live payloads into a stream of deltas
+
+    Each poll fetches the live games and their box scores (concurrently,
+    bypassing the cache) and compares every game and player line with
+    the previous poll by hash. Only changes are emitted, as dicts:
+
+        {"type": "game", "game_id", "status", "period", "clock",
+         "home": {...}, "visitors": {...}, "ended"}
+        {"type": "player", "game_id", "player_id", "player_name",
+         "team_id", "line": <player_stats row>, "changes": {field: +n}}
+
+    When a game leaves the live list its box score is fetched once
+    more, so the last baskets are not missed, and a game delta with
+    ended=True closes it out.
+
+    Deltas reach subscribers as callbacks (one call per poll, with the
+    list of deltas) or through an async iterator:
+
+        poller = LiveBoxScorePoller(interval=10)
+        poller.subscribe(lambda deltas: print(len(deltas), "changes"))
+        poller.start()
+
+        async for delta in poller.stream():
+            ...
+
+    Each poll costs one request plus one per live game.
+    """
+
+    # Player line fields compared between polls
+    LINE_FIELDS = (
+        "minutes", "points", "rebounds", "offensive_rebounds", "defensive_rebounds",
+        "assists", "steals", "blocks", "turnovers", "personal_fouls",
+        "fgm", "fga", "tpm", "tpa", "ftm", "fta", "plus_minus"
+    )
+
+    def __init__(
+        self,
+        client: Optional[APISportsClient] = None,
+        interval: float = 15.0,
+        max_concurrency: int = 8
+    ):
+        """
+        interval: seconds between the starts of consecutive polls
+        max_concurrency: box scores fetched at once
+        """
+        self.client = client or APISportsClient()
+        self.interval = interval
+        self.api = AsyncAPISportsClient(client=self.client, max_concurrency=max_concurrency)
+
+        # Previous snapshot: game_id -> (state hash, game) and
+        # game_id -> {player_id: (line hash, line)}
+        self._games: Dict[int, Tuple[int, Dict]] = {}
+        self._lines: Dict[int, Dict[int, Tuple[int, Dict]]] = {}
+
+        self._subscribers: List[Callable[[List[Dict]], None]] = []
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.polls = 0
+        self.deltas_emitted = 0
+
+    # ============== SUBSCRIBERS ==============
+
+    def subscribe(self, callback: Callable[[List[Dict]], None]) -> Callable[[], None]:
+        """Call `callback(deltas)` after every poll with changes; returns an unsubscribe function"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    async def stream(self):
+        """
+        Async iterator over deltas (starts the poller if needed)
+
+        Deltas are handed over from the polling thread through a queue,
+        so a slow consumer never blocks polling.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        unsubscribe = self.subscribe(lambda deltas: loop.call_soon_threadsafe(queue.put_nowait, deltas))
+        self.start()
+        try:
+            while True:
+                for delta in await queue.get():
+                    yield delta
+        finally:
+            unsubscribe()
+
+    def _dispatch(self, deltas: List[Dict]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(deltas)
+            except Exception as e:
+                print(f"Live poller subscriber failed: {e}")
+
+    # ============== POLLING ==============
+
+    def start(self):
+        """Poll every `interval` seconds on a background thread"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="live-box-scores")
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling (the current poll finishes first)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        self.api.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                deltas = asyncio.run(self.poll())
+            except APISportsError as e:
+                print(f"Live poll failed: {e}")
+                deltas = []
+            if deltas:
+                self._dispatch(deltas)
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    def poll_once(self) -> List[Dict]:
+        """One poll from synchronous code; returns the deltas (subscribers are not called)"""
+        return asyncio.run(self.poll())
+
+    async def poll(self) -> List[Dict]:
+        """Fetch live games and box scores, update the snapshot and return what changed"""
+        live = {
+            game["id"]: game
+            for game in await self.api.get_live_games(fresh=True)
+            if game.get("id")
+        }
+        ended = [game_id for game_id in self._games if game_id not in live]
+
+        # One last look at games that just finished
+        stats = await self.api.gather(
+            self.client.get_game_statistics, list(live) + ended, False, True,
+            return_exceptions=True
+        )
+
+        deltas = []
+        with self._poll_lock:
+            for game_id, game in live.items():
+                deltas.extend(self._diff_game(game, stats.get(game_id)))
+            for game_id in ended:
+                game = self._games.pop(game_id)[1]
+                deltas.extend(self._diff_lines(game, stats.get(game_id)))
+                deltas.append(dict(_game_summary(game), ended=True))
+                self._lines.pop(game_id, None)
+
+        self.polls += 1
+        self.deltas_emitted += len(deltas)
+        return deltas
+
+    # ============== DIFFING ==============
+
+    def _diff_game(self, game: Dict, stats) -> List[Dict]:
+        """Game delta if score/status changed, plus changed player lines"""
+        deltas = []
+        summary = _game_summary(game)
+        state = hash((
+            summary["status"], summary["period"],
+            summary["home"]["points"], summary["visitors"]["points"]
+        ))
+        previous = self._games.get(game["id"])
+        self._games[game["id"]] = (state, game)
+        if previous is None or previous[0] != state:
+            deltas.append(dict(summary, ended=False))
+        return deltas + self._diff_lines(game, stats)
+
+    def _diff_lines(self, game: Dict, stats) -> List[Dict]:
+        """Player deltas for lines whose hash differs from the last poll"""
+        if isinstance(stats, Exception):
+            # Keep the old snapshot; the changes show up next poll
+            print(f"Live box score for game {game['id']} failed: {stats}")
+            return []
+
+        teams = game.get("teams") or {}
+        home_id = (teams.get("home") or {}).get("id")
+        away_id = (teams.get("visitors") or {}).get("id")
+        game_date = _local_date(game) or date.today()
+        lines = self._lines.setdefault(game["id"], {})
+
+        deltas = []
+        for stat in stats or []:
+            line = normalize_stat_row(stat, game["id"], game_date, home_id, away_id)
+            if line is None:
+                continue
+            values = tuple(line[field] for field in self.LINE_FIELDS)
+            line_hash = hash(values)
+
+            previous = lines.get(line["player_id"])
+            if previous is not None and previous[0] == line_hash:
+                continue
+            lines[line["player_id"]] = (line_hash, line)
+
+            old = previous[1] if previous is not None else {}
+            player = stat.get("player") or {}
+            deltas.append({
+                "type": "player",
+                "game_id": game["id"],
+                "player_id": line["player_id"],
+                "player_name": f"{player.get('firstname', '')} {player.get('lastname', '')}".strip(),
+                "team_id": (stat.get("team") or {}).get("id"),
+                "line": line,
+                "changes": {
+                    field: value - (old.get(field) or 0)
+                    for field, value in zip(self.LINE_FIELDS, values)
+                    if value != old.get(field, 0)
+                }
+            })
+        return deltas
+
+    def snapshot(self) -> Dict[int, List[Dict]]:
+        """Current player lines per live game"""
+        with self._poll_lock:
+            return {
+                game_id: [line for _, line in lines.values()]
+                for game_id, lines in self._lines.items()
+            }
+
+
+def _game_summary(game: Dict) -> Dict:
+    """Score and clock of a live game"""
+    status = game.get("status") or {}
+    teams = game.get("teams") or {}
+    scores = game.get("scores") or {}
+
+    def side(name):
+        team = teams.get(name) or {}
+        return {
+            "id": team.get("id"),
+            "name": team.get("name"),
+            "points": (scores.get(name) or {}).get("points")
+        }
+
+    return {
+        "type": "game",
+        "game_id": game.get("id"),
+        "status": status.get("short"),
+        "period": (game.get("periods") or {}).get("current"),
+        "clock": status.get("clock"),
+        "home": side("home"),
+        "visitors": side("visitors")
+    }
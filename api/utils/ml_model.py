@@ -4,16 +4,36 @@ Uses scikit-learn for probability predictions
 """
 
 import os
+import copy
 import json
+import time
+import pickle
+import hashlib
+import threading
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple, Optional, Union
 import joblib
 from datetime import datetime
 
+from .game_log import GameLog
+
+
+class _ModelState(NamedTuple):
+    """
+    One consistent set of loaded artifacts. Never mutated: loads, training
+    and registry swaps build a new state and replace the reference, so a
+    reader holding a state always sees matching models, scalers and
+    compiled evaluators.
+    """
+    model_path: str
+    version: Optional[str]
+    models: Dict
+    scalers: Dict
+    compiled: Dict
+    # Stats whose artifacts have already been looked up on disk
+    checked: FrozenSet[str]
+
 
 class NBAStatPredictor:
     """
@@ -30,45 +50,494 @@ class NBAStatPredictor:
     
     STAT_TYPES = ["points", "rebounds", "assists", "threes", "steals", "blocks", "pra"]
     
-    def __init__(self, model_path: Optional[str] = None):
-        self.models = {}
-        self.scalers = {}
-        self.model_path = model_path or os.path.join(os.path.dirname(__file__), "../ml/models")
+    # Common names accepted for each stat type
+    STAT_ALIASES = {
+        "pts": "points",
+        "reb": "rebounds",
+        "ast": "assists",
+        "3pm": "threes",
+        "three-pointers": "threes",
+        "stl": "steals",
+        "blk": "blocks",
+        "pts+reb+ast": "pra",
+        "points+rebounds+assists": "pra"
+    }
+    
+    # Game log keys summed for each stat type
+    STAT_KEYS = {
+        "points": ("points",),
+        "rebounds": ("rebounds",),
+        "assists": ("assists",),
+        "threes": ("threes",),
+        "steals": ("steals",),
+        "blocks": ("blocks",),
+        "pra": ("points", "rebounds", "assists")
+    }
+    
+    # Season average keys summed for each stat type
+    AVG_KEYS = {
+        "points": ("ppg",),
+        "rebounds": ("rpg",),
+        "assists": ("apg",),
+        "threes": ("tpg",),
+        "steals": ("spg",),
+        "blocks": ("bpg",),
+        "pra": ("ppg", "rpg", "apg")
+    }
+    
+    # Columns of the feature vector built by prepare_features
+    FEATURE_COLUMNS = [
+        'season_avg', 'recent_avg_5', 'recent_avg_3', 'max_recent',
+        'min_recent', 'std_recent', 'trend', 'is_home', 
+        'opp_def_rating', 'rest_days', 'minutes_avg', 'usage_proxy'
+    ]
+    
+    # Line-dependent columns appended for line-aware models
+    LINE_FEATURE_COLUMNS = ['line', 'line_diff']
+    
+    # Optional single-file artifact holding every stat's model and scaler
+    BUNDLE_FILE = "models_bundle.pkl"
+    
+    # Watermark of the last incremental update from settled predictions
+    UPDATE_STATE_FILE = "update_state.json"
+    
+    # Settled prediction fields kept for rows not yet folded into a model
+    PENDING_COLUMNS = ["player_id", "game_date", "stat_type", "line", "actual_value", "settled_at"]
+    
+    # Unused settled rows are retried for this many days, then dropped
+    PENDING_MAX_DAYS = 14
+    
+    # predict() defaults for the optional predict_batch fields, in
+    # prepare_features argument order
+    BATCH_DEFAULTS = {"opponent_def_rating": 110.0, "is_home": True, "rest_days": 1}
+    
+    # Bumped whenever FEATURE_COLUMNS / LINE_FEATURE_COLUMNS change meaning;
+    # registry versions built for another schema are never served
+    FEATURE_SCHEMA_VERSION = 2
+    
+    # Seconds between checks of the registry's CURRENT pointer
+    REGISTRY_CHECK_INTERVAL = 5.0
+    
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        mmap_mode: Optional[str] = None,
+        lazy: bool = True,
+        registry=None
+    ):
+        """
+        model_path: directory holding the saved artifacts
+        mmap_mode: passed to joblib.load (e.g. "r") so array data in the
+            pickled models is memory-mapped instead of read into memory
+            (compiled evaluators are always read in full)
+        lazy: load each stat's artifacts on first use instead of up front
+        registry: a ModelRegistry to serve from instead of model_path;
+            the predictor follows the registry's CURRENT version and
+            hot-swaps when it is promoted or rolled back
+        """
+        self._state = _ModelState(
+            model_path=model_path or os.path.join(os.path.dirname(__file__), "../ml/models"),
+            version=None,
+            models={},
+            scalers={},
+            compiled={},
+            checked=frozenset()
+        )
+        self._state_lock = threading.Lock()
+        self.mmap_mode = mmap_mode
+        
+        # Stats trained since the last save
+        self._dirty = set()
         
-        # Try to load existing models
-        self._load_models()
+        self.registry = registry
+        self._registry_checked_at = 0.0
+        self._swap_lock = threading.Lock()
+        if registry is not None:
+            self.refresh()
+        
+        if not lazy:
+            self._load_models()
     
-    def _load_models(self):
-        """Load pre-trained models if they exist"""
-        for stat in self.STAT_TYPES:
-            model_file = os.path.join(self.model_path, f"{stat}_model.pkl")
-            scaler_file = os.path.join(self.model_path, f"{stat}_scaler.pkl")
+    def refresh(self) -> bool:
+        """
+        Switch to the registry's CURRENT version if it changed
+        
+        The new version is verified (checksums, feature schema) and its
+        already-used stats are loaded before the swap, so in-flight
+        callers keep the old models until the new ones are ready. Stats
+        trained but not yet saved block the swap. Returns True if swapped.
+        """
+        if self.registry is None:
+            return False
+        self._registry_checked_at = time.monotonic()
+        
+        version = self.registry.current()
+        if version is None or version == self.version or self._dirty:
+            return False
+        if not self._swap_lock.acquire(blocking=False):
+            return False
+        
+        try:
+            try:
+                self.registry.verify(version)
+            except ValueError as e:
+                print(f"Not loading model version {version}: {e}")
+                return False
+            
+            staged = NBAStatPredictor(model_path=self.registry.path(version), mmap_mode=self.mmap_mode)
+            if self._checked:
+                staged._load_models(sorted(self._checked))
+            
+            # One reference swap: readers see either version, never a mix
+            with self._state_lock:
+                self._state = staged._state._replace(version=version)
+            return True
+        finally:
+            self._swap_lock.release()
+    
+    # ============== LOADED STATE ==============
+    
+    @property
+    def model_path(self) -> str:
+        return self._state.model_path
+    
+    @property
+    def version(self) -> Optional[str]:
+        return self._state.version
+    
+    @property
+    def models(self) -> Dict:
+        return self._state.models
+    
+    @property
+    def scalers(self) -> Dict:
+        return self._state.scalers
+    
+    @property
+    def compiled(self) -> Dict:
+        return self._state.compiled
+    
+    @property
+    def _checked(self) -> FrozenSet[str]:
+        return self._state.checked
+    
+    def _publish(
+        self,
+        base: Optional[_ModelState] = None,
+        models: Optional[Dict] = None,
+        scalers: Optional[Dict] = None,
+        compiled: Optional[Dict] = None,
+        checked=(),
+        overwrite: bool = True
+    ):
+        """
+        Merge artifacts into a new state and swap it in
+        
+        base: the state the artifacts were loaded against; if a registry
+            swap replaced it meanwhile they are discarded
+        overwrite: replace stats already present (False for lazy loads,
+            so a load racing with training never clobbers the new model)
+        """
+        with self._state_lock:
+            current = self._state
+            if base is not None and base.model_path != current.model_path:
+                return
+            
+            def merged(old, new):
+                if not new:
+                    return old
+                if not overwrite:
+                    new = {k: v for k, v in new.items() if k not in old}
+                return {**old, **new}
+            
+            self._state = current._replace(
+                models=merged(current.models, models),
+                scalers=merged(current.scalers, scalers),
+                compiled=merged(current.compiled, compiled),
+                checked=current.checked | frozenset(checked)
+            )
+    
+    def _maybe_refresh(self):
+        """Poll the registry pointer at most every REGISTRY_CHECK_INTERVAL seconds"""
+        if self.registry is not None and time.monotonic() - self._registry_checked_at >= self.REGISTRY_CHECK_INTERVAL:
+            self.refresh()
+    
+    def _load_models(self, stats: Optional[List[str]] = None):
+        """Load pre-trained models if they exist (all stats by default)"""
+        state = self._state
+        stats = [s for s in (stats or self.STAT_TYPES) if s not in state.checked]
+        
+        # Compiled evaluators need neither sklearn nor the pickles
+        compiled = {}
+        for stat in list(stats):
+            compiled_file = os.path.join(state.model_path, f"{stat}_compiled.npz")
+            if os.path.exists(compiled_file):
+                from .compiled_model import CompiledModel
+                compiled[stat] = CompiledModel.load(compiled_file)
+                stats.remove(stat)
+        if compiled:
+            self._publish(state, compiled=compiled, checked=compiled, overwrite=False)
+        
+        if stats:
+            self._load_pickled(stats)
+    
+    def _load_pickled(self, stats: List[str]):
+        """Load sklearn models/scalers from the bundle or per-stat pickles"""
+        state = self._state
+        stats = [s for s in stats if s not in state.models]
+        if not stats:
+            return
+        
+        models, scalers, checked = {}, {}, set()
+        
+        # A bundle covers every stat with a single open
+        bundle_file = os.path.join(state.model_path, self.BUNDLE_FILE)
+        if os.path.exists(bundle_file):
+            bundle = joblib.load(bundle_file, mmap_mode=self.mmap_mode)
+            for stat in self.STAT_TYPES:
+                if stat in state.models or (stat in state.checked and stat not in stats):
+                    continue
+                if stat in bundle.get("models", {}) and stat in bundle.get("scalers", {}):
+                    models[stat] = bundle["models"][stat]
+                    scalers[stat] = bundle["scalers"][stat]
+                checked.add(stat)
+        else:
+            for stat in stats:
+                model_file = os.path.join(state.model_path, f"{stat}_model.pkl")
+                scaler_file = os.path.join(state.model_path, f"{stat}_scaler.pkl")
+                
+                if os.path.exists(model_file) and os.path.exists(scaler_file):
+                    models[stat] = joblib.load(model_file, mmap_mode=self.mmap_mode)
+                    scalers[stat] = joblib.load(scaler_file, mmap_mode=self.mmap_mode)
+                checked.add(stat)
+        
+        self._publish(state, models=models, scalers=scalers, checked=checked, overwrite=False)
+    
+    def _get_model(self, stat_type: str) -> Optional[Tuple]:
+        """Get sklearn (model, scaler) for a stat, loading it on first use"""
+        self._maybe_refresh()
+        if stat_type not in self._checked:
+            self._load_models([stat_type])
+        if stat_type in self.compiled and stat_type not in self.models:
+            # Compiled evaluators are inference-only; load the source model
+            self._load_pickled([stat_type])
+        
+        # One snapshot, so the model and scaler always belong together
+        state = self._state
+        if stat_type in state.models and stat_type in state.scalers:
+            return state.models[stat_type], state.scalers[stat_type]
+        return None
+    
+    def _model_over_probability(
+        self,
+        stat_type: str,
+        X: np.ndarray,
+        lines: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """
+        Over probability (0-100) for each feature row from the trained
+        model, or None if the stat has no model. Compiled models are
+        preferred over sklearn ones.
+        """
+        self._maybe_refresh()
+        if stat_type not in self._checked:
+            self._load_models([stat_type])
+        
+        compiled = self._state.compiled.get(stat_type)
+        if compiled is not None:
+            X = self._with_line_features(X, lines, compiled.n_features)
+            return compiled.predict_proba(X)[:, 1] * 100
+        
+        trained = self._get_model(stat_type)
+        if not trained:
+            return None
+        
+        model, scaler = trained
+        X = self._with_line_features(X, lines, scaler.n_features_in_)
+        prob = model.predict_proba(scaler.transform(X))
+        if prob.shape[1] < 2:
+            return np.full(len(X), 50.0)
+        return prob[:, 1] * 100
+    
+    def _with_line_features(self, X: np.ndarray, lines: np.ndarray, n_features: int) -> np.ndarray:
+        """
+        Append line and line minus season average to feature rows when
+        the model expects them (models trained before the line was an
+        input take the base features only)
+        """
+        if n_features == X.shape[1]:
+            return X
+        
+        lines = np.asarray(lines, dtype=float).reshape(-1)
+        return np.column_stack([X, lines, lines - X[:, 0]])
+    
+    @classmethod
+    def _training_matrix(cls, training_data: pd.DataFrame) -> np.ndarray:
+        """Model input matrix (base + line features) from a training DataFrame"""
+        if 'line_diff' not in training_data:
+            training_data = training_data.assign(
+                line_diff=training_data['line'] - training_data['season_avg']
+            )
+        return training_data[cls.FEATURE_COLUMNS + cls.LINE_FEATURE_COLUMNS].values
+    
+    def _score(self, stat_type: str, lines: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Over probability (0-100) for each (line, feature row) pair"""
+        lines = np.asarray(lines, dtype=float)
+        model_probs = self._model_over_probability(stat_type, X, lines)
+        if model_probs is not None:
+            return model_probs
+        
+        # Fallback to heuristic model
+        return self._heuristic_predict_batch(lines, X)
+    
+    def export_compiled(self, stats: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Compile trained models into flat NumPy tree evaluators
+        
+        Writes {stat}_compiled.npz next to the pickles; these are
+        loaded in preference to the sklearn artifacts and evaluated
+        without importing sklearn. Returns {stat: path}.
+        
+        Registry versions are immutable: a registry-backed predictor
+        publishes a new (unpromoted) version holding the compiled
+        evaluators, so they are checksummed in its manifest.
+        """
+        from .compiled_model import compile_model
+        
+        if self.registry is not None:
+            compiled = {}
+            for stat in stats or self.STAT_TYPES:
+                trained = self._get_model(stat)
+                if trained:
+                    compiled[stat] = compile_model(*trained)
+            if not compiled:
+                return {}
+            
+            self._publish(compiled=compiled)
+            version = self.registry.publish(self, notes=f"compiled: {', '.join(compiled)}")
+            return {
+                stat: os.path.join(self.registry.path(version), f"{stat}_compiled.npz")
+                for stat in compiled
+            }
+        
+        os.makedirs(self.model_path, exist_ok=True)
+        paths = {}
+        
+        for stat in stats or self.STAT_TYPES:
+            trained = self._get_model(stat)
+            if not trained:
+                continue
+            
+            model, scaler = trained
+            compiled = compile_model(model, scaler)
+            path = os.path.join(self.model_path, f"{stat}_compiled.npz")
+            tmp_path = f"{path}.tmp"
+            compiled.save(tmp_path)
+            os.replace(tmp_path, path)
             
-            if os.path.exists(model_file) and os.path.exists(scaler_file):
-                self.models[stat] = joblib.load(model_file)
-                self.scalers[stat] = joblib.load(scaler_file)
+            self._publish(compiled={stat: compiled})
+            paths[stat] = path
+        
+        return paths
     
-    def _save_models(self):
-        """Save trained models"""
+    def _save_models(self, bundle: Optional[bool] = None):
+        """
+        Save trained models
+        
+        Only stats trained since the last save are written, and an
+        artifact whose bytes are unchanged is left untouched.
+        
+        bundle: also write BUNDLE_FILE; by default an existing bundle is
+        rewritten (when something changed) so it never goes stale
+        
+        Registry versions are immutable: a registry-backed predictor
+        publishes its models as a new (unpromoted) version instead.
+        """
+        if self.registry is not None:
+            if self._dirty:
+                self.registry.publish(self, notes=f"trained: {', '.join(sorted(self._dirty))}")
+                self._dirty.clear()
+            return
+        
         os.makedirs(self.model_path, exist_ok=True)
         
+        bundle_file = os.path.join(self.model_path, self.BUNDLE_FILE)
+        if bundle is None:
+            bundle = os.path.exists(bundle_file)
+        if bundle:
+            # Pull in untouched stats so the rewritten bundle stays complete
+            self._load_models()
+        
+        state = self._state
+        changed = []
         for stat in self.STAT_TYPES:
-            if stat in self.models:
-                joblib.dump(self.models[stat], os.path.join(self.model_path, f"{stat}_model.pkl"))
-                joblib.dump(self.scalers[stat], os.path.join(self.model_path, f"{stat}_scaler.pkl"))
+            if stat in self._dirty and stat in state.models:
+                model_written = self._dump(state.models[stat], os.path.join(self.model_path, f"{stat}_model.pkl"))
+                scaler_written = self._dump(state.scalers[stat], os.path.join(self.model_path, f"{stat}_scaler.pkl"))
+                if model_written or scaler_written:
+                    changed.append(stat)
+        self._dirty.clear()
+        
+        if bundle and (changed or not os.path.exists(bundle_file)):
+            self._dump(
+                {"models": dict(state.models), "scalers": dict(state.scalers)},
+                bundle_file
+            )
+        
+        # Recompile changed stats that already have a compiled artifact
+        # so it never shadows a newer model
+        stale = [
+            stat for stat in changed
+            if os.path.exists(os.path.join(self.model_path, f"{stat}_compiled.npz"))
+        ]
+        if stale:
+            self.export_compiled(stale)
+    
+    @staticmethod
+    def _dump(obj, path: str) -> bool:
+        """
+        Write an artifact via a temp file and rename, so a file that is
+        currently memory-mapped (or being read) is never truncated in place
+        
+        Returns False (and leaves the file alone) if the saved artifact
+        holds the same fitted parameters. Parameters are compared by
+        _fingerprint, not by pickle bytes, which differ for identical
+        models returned from a worker process.
+        """
+        if os.path.exists(path):
+            try:
+                unchanged = _fingerprint(joblib.load(path)) == _fingerprint(obj)
+            except Exception:
+                unchanged = False
+            if unchanged:
+                return False
+        
+        tmp_path = f"{path}.tmp"
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+    
+    def save_bundle(self):
+        """Write all loaded/trained stats into a single bundle artifact"""
+        self._save_models(bundle=True)
     
     def prepare_features(
         self,
         season_avg: Dict,
-        recent_games: List[Dict],
+        recent_games: Union[GameLog, List[Dict]],
         opponent_def_rating: float = 110.0,
         is_home: bool = True,
-        rest_days: int = 1
-    ) -> np.ndarray:
+        rest_days: int = 1,
+        stats: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
         """
-        Prepare feature vector for prediction
+        Prepare feature vectors for prediction
+        
+        recent_games may be a GameLog or a list of per-game dicts (which
+        are normalized into a GameLog once). Only the stat types listed
+        in `stats` are materialized (default: all).
         
-        Returns array of features:
+        Returns {stat_type: array of features}:
         [
             season_avg,
             recent_avg (last 5),
@@ -84,93 +553,101 @@ class NBAStatPredictor:
             usage_trend
         ]
         """
-        if not recent_games:
-            recent_games = []
+        game_log = GameLog.coerce(recent_games)
         
-        # Extract stat values from recent games (default to 0 if missing)
-        def safe_get(game: Dict, key: str, default: float = 0) -> float:
-            val = game.get(key, default)
-            return float(val) if val is not None else default
+        stats = self.STAT_TYPES if stats is None else [s for s in stats if s in self.STAT_TYPES]
         
-        # Calculate features for each stat type
-        features = {}
+        # Only pull the game log columns the requested stats need
+        keys = {"minutes"}
+        for stat in stats:
+            keys.update(self.STAT_KEYS[stat])
+        columns = {key: game_log[key].astype(np.float64) for key in keys}
         
-        for stat in self.STAT_TYPES:
-            # Map stat name to actual key in data
-            stat_key_map = {
-                "points": "points",
-                "rebounds": "rebounds",
-                "assists": "assists",
-                "threes": "threes",
-                "steals": "steals",
-                "blocks": "blocks",
-                "pra": None  # Calculated field
-            }
-            
-            # Get season average
-            avg_key_map = {
-                "points": "ppg",
-                "rebounds": "rpg", 
-                "assists": "apg",
-                "threes": "tpg",
-                "steals": "spg",
-                "blocks": "bpg",
-                "pra": None
-            }
-            
-            if stat == "pra":
-                # Points + Rebounds + Assists
-                season_val = season_avg.get("ppg", 0) + season_avg.get("rpg", 0) + season_avg.get("apg", 0)
-                recent_vals = [
-                    safe_get(g, "points") + safe_get(g, "rebounds") + safe_get(g, "assists")
-                    for g in recent_games
-                ]
-            else:
-                season_val = season_avg.get(avg_key_map.get(stat, stat), 0)
-                stat_key = stat_key_map.get(stat, stat)
-                recent_vals = [safe_get(g, stat_key) for g in recent_games]
-            
-            # Calculate recent averages
-            last_5 = recent_vals[:5] if len(recent_vals) >= 5 else recent_vals
-            last_3 = recent_vals[:3] if len(recent_vals) >= 3 else recent_vals
-            
-            recent_avg_5 = np.mean(last_5) if last_5 else season_val
-            recent_avg_3 = np.mean(last_3) if last_3 else season_val
-            max_recent = max(recent_vals) if recent_vals else season_val
-            min_recent = min(recent_vals) if recent_vals else season_val
-            std_recent = np.std(recent_vals) if len(recent_vals) > 1 else 0
-            
-            # Trend: recent form vs season average
-            trend = (recent_avg_5 - season_val) / max(season_val, 1) if season_val else 0
-            
-            # Get minutes info
-            minutes_vals = [safe_get(g, "minutes") for g in recent_games]
-            minutes_avg = np.mean(minutes_vals) if minutes_vals else season_avg.get("mpg", 30)
+        # Get minutes info
+        minutes_vals = columns["minutes"]
+        minutes_avg = np.mean(minutes_vals) if len(minutes_vals) else season_avg.get("mpg", 30)
+        
+        features = {}
+        for stat in stats:
+            season_val = sum(season_avg.get(k, 0) for k in self.AVG_KEYS[stat])
+            stat_keys = self.STAT_KEYS[stat]
+            recent_vals = columns[stat_keys[0]]
+            for k in stat_keys[1:]:
+                recent_vals = recent_vals + columns[k]
             
-            # Build feature array for this stat
-            features[stat] = np.array([
-                season_val,           # 0: season average
-                recent_avg_5,         # 1: last 5 games avg
-                recent_avg_3,         # 2: last 3 games avg  
-                max_recent,           # 3: max in recent games
-                min_recent,           # 4: min in recent games
-                std_recent,           # 5: consistency (std dev)
-                trend,                # 6: form trend
-                1.0 if is_home else 0.0,  # 7: home/away
-                opponent_def_rating,  # 8: opponent defense
-                rest_days,            # 9: days of rest
-                minutes_avg,          # 10: expected minutes
-                trend * minutes_avg / 30  # 11: usage proxy
-            ])
+            features[stat] = self._stat_features(
+                season_val, recent_vals, minutes_avg, opponent_def_rating, is_home, rest_days
+            )
         
         return features
     
+    @classmethod
+    def _stat_features(
+        cls,
+        season_val: float,
+        recent_vals: np.ndarray,
+        minutes_avg: float,
+        opponent_def_rating: float,
+        is_home: bool,
+        rest_days: int
+    ) -> np.ndarray:
+        """Build the feature array for one stat from its recent values"""
+        n = len(recent_vals)
+        
+        # Calculate recent averages
+        return cls._feature_vector(
+            season_val,
+            np.mean(recent_vals[:5]) if n else season_val,
+            np.mean(recent_vals[:3]) if n else season_val,
+            recent_vals.max() if n else season_val,
+            recent_vals.min() if n else season_val,
+            np.std(recent_vals) if n > 1 else 0,
+            minutes_avg, opponent_def_rating, is_home, rest_days
+        )
+    
+    @classmethod
+    def _feature_vector(
+        cls,
+        season_val: float,
+        recent_avg_5: float,
+        recent_avg_3: float,
+        max_recent: float,
+        min_recent: float,
+        std_recent: float,
+        minutes_avg: float,
+        opponent_def_rating: float,
+        is_home: bool,
+        rest_days: int
+    ) -> np.ndarray:
+        """
+        Lay out one stat's summaries in FEATURE_COLUMNS order (shared by
+        prepare_features and FeatureCache, so both always agree)
+        """
+        # Trend: recent form vs season average
+        trend = (recent_avg_5 - season_val) / max(season_val, 1) if season_val else 0
+        
+        values = {
+            'season_avg': season_val,
+            'recent_avg_5': recent_avg_5,
+            'recent_avg_3': recent_avg_3,
+            'max_recent': max_recent,
+            'min_recent': min_recent,
+            'std_recent': std_recent,       # consistency
+            'trend': trend,                 # form trend
+            'is_home': 1.0 if is_home else 0.0,
+            'opp_def_rating': opponent_def_rating,
+            'rest_days': rest_days,
+            'minutes_avg': minutes_avg,     # expected minutes
+            'usage_proxy': trend * minutes_avg / 30
+        }
+        return np.array([values[column] for column in cls.FEATURE_COLUMNS])
+    
     def predict(
         self,
         stat_type: str,
         line: float,
         season_avg: Dict,
-        recent_games: List[Dict],
+        recent_games: Union[GameLog, List[Dict]],
         opponent_def_rating: float = 110.0,
         is_home: bool = True,
         rest_days: int = 1
@@ -186,24 +663,11 @@ class NBAStatPredictor:
             "factors": dict of feature importances
         }
         """
-        stat_type = stat_type.lower()
-        if stat_type not in self.STAT_TYPES:
-            # Try to map common names
-            stat_map = {
-                "pts": "points",
-                "reb": "rebounds", 
-                "ast": "assists",
-                "3pm": "threes",
-                "three-pointers": "threes",
-                "stl": "steals",
-                "blk": "blocks",
-                "pts+reb+ast": "pra",
-                "points+rebounds+assists": "pra"
-            }
-            stat_type = stat_map.get(stat_type, stat_type)
+        stat_type = self._normalize_stat_type(stat_type)
         
         features = self.prepare_features(
-            season_avg, recent_games, opponent_def_rating, is_home, rest_days
+            season_avg, recent_games, opponent_def_rating, is_home, rest_days,
+            stats=[stat_type]
         )
         
         if stat_type not in features:
@@ -214,17 +678,187 @@ class NBAStatPredictor:
                 "error": f"Unknown stat type: {stat_type}"
             }
         
-        X = features[stat_type].reshape(1, -1)
+        return self.predict_from_features(stat_type, line, features[stat_type], season_avg)
+    
+    def predict_from_features(
+        self,
+        stat_type: str,
+        line: float,
+        features: np.ndarray,
+        season_avg: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Predict from a prebuilt feature vector (prepare_features layout),
+        e.g. one served by FeatureCache without touching the game log
+        """
+        stat_type = self._normalize_stat_type(stat_type)
+        X = np.asarray(features, dtype=float).reshape(1, -1)
         
-        # Check if we have a trained model
-        if stat_type in self.models and stat_type in self.scalers:
-            # Use ML model
-            X_scaled = self.scalers[stat_type].transform(X)
-            prob = self.models[stat_type].predict_proba(X_scaled)[0]
-            over_prob = prob[1] * 100 if len(prob) > 1 else 50.0
-        else:
-            # Fallback to heuristic model
-            over_prob = self._heuristic_predict(stat_type, line, features[stat_type])
+        # Trained model if we have one, heuristic otherwise
+        over_prob = self._score(stat_type, np.array([line]), X)[0]
+        
+        # Identify key factors
+        factors = self._analyze_factors(stat_type, line, X[0], season_avg or {})
+        
+        return self._format_result(stat_type, line, over_prob, factors)
+    
+    def predict_batch(self, requests: Union[pd.DataFrame, List[Dict]]) -> List[Dict]:
+        """
+        Predict many (player, stat, line) requests in one pass
+        
+        Each request carries the same fields as predict():
+        stat_type, line, season_avg, recent_games and optionally
+        opponent_def_rating, is_home, rest_days (missing, None or NaN
+        take predict()'s defaults), plus an optional player_id.
+        
+        Requests with the same player_id and game context share one
+        feature build; requests without a player_id are built alone.
+        Features are stacked into one matrix and each stat type is
+        scored with a single scaler/model (or heuristic) call.
+        Returns one result dict per request, in input order.
+        """
+        if isinstance(requests, pd.DataFrame):
+            requests = requests.to_dict("records")
+        
+        n = len(requests)
+        results: List[Optional[Dict]] = [None] * n
+        if n == 0:
+            return []
+        
+        stat_types = []
+        lines = np.zeros(n)
+        keys = []
+        season_avgs = [
+            {} if _is_missing(req.get("season_avg")) else req["season_avg"]
+            for req in requests
+        ]
+        
+        # The same player appears once per stat and line in a slate, so
+        # requests are grouped by input set and features built once per group
+        groups = {}
+        
+        for i, req in enumerate(requests):
+            stat_type = self._normalize_stat_type(req.get("stat_type", ""))
+            stat_types.append(stat_type)
+            lines[i] = float(req.get("line", 0) or 0)
+            
+            if stat_type not in self.STAT_TYPES:
+                results[i] = {
+                    "probability": 50.0,
+                    "confidence": "low",
+                    "prediction": "unknown",
+                    "error": f"Unknown stat type: {stat_type}"
+                }
+                keys.append(None)
+                continue
+            
+            season_avg = season_avgs[i]
+            recent_games = req.get("recent_games")
+            if _is_missing(recent_games):
+                recent_games = []
+            player_id = req.get("player_id")
+            context = tuple(
+                default if _is_missing(req.get(name)) else req[name]
+                for name, default in self.BATCH_DEFAULTS.items()
+            )
+            if _is_missing(player_id):
+                key = ("row", i) + context
+            else:
+                key = ("player", player_id) + context
+            if key not in groups:
+                groups[key] = (season_avg, recent_games, set())
+            groups[key][2].add(stat_type)
+            keys.append(key)
+        
+        group_features = {
+            key: self.prepare_features(
+                season_avg, recent_games, *key[2:], stats=list(stats)
+            )
+            for key, (season_avg, recent_games, stats) in groups.items()
+        }
+        rows = [
+            group_features[key][stat_types[i]] if key is not None else None
+            for i, key in enumerate(keys)
+        ]
+        
+        over_probs = np.full(n, 50.0)
+        stat_arr = np.array(stat_types, dtype=object)
+        
+        for stat_type in self.STAT_TYPES:
+            idx = np.flatnonzero(stat_arr == stat_type)
+            if idx.size == 0:
+                continue
+            
+            X = np.vstack([rows[i] for i in idx])
+            
+            over_probs[idx] = self._score(stat_type, lines[idx], X)
+        
+        for i, req in enumerate(requests):
+            if results[i] is not None:
+                continue
+            factors = self._analyze_factors(
+                stat_types[i], lines[i], rows[i], season_avgs[i]
+            )
+            results[i] = self._format_result(stat_types[i], req.get("line", 0), over_probs[i], factors)
+        
+        return results
+    
+    def predict_curve(
+        self,
+        stat_type: str,
+        lines: List[float],
+        season_avg: Dict,
+        recent_games: Union[GameLog, List[Dict]],
+        opponent_def_rating: float = 110.0,
+        is_home: bool = True,
+        rest_days: int = 1
+    ) -> List[Dict]:
+        """
+        Predict a ladder of lines for one player and stat
+        
+        Features are built once and every line is scored in a single
+        model (or heuristic) call. Returns one predict()-style result
+        per line, in input order.
+        """
+        stat_type = self._normalize_stat_type(stat_type)
+        if stat_type not in self.STAT_TYPES:
+            return [
+                {
+                    "probability": 50.0,
+                    "confidence": "low",
+                    "prediction": "unknown",
+                    "error": f"Unknown stat type: {stat_type}"
+                }
+                for _ in lines
+            ]
+        
+        features = self.prepare_features(
+            season_avg, recent_games, opponent_def_rating, is_home, rest_days,
+            stats=[stat_type]
+        )[stat_type]
+        
+        line_arr = np.asarray(lines, dtype=float)
+        X = np.tile(features, (len(line_arr), 1))
+        over_probs = self._score(stat_type, line_arr, X)
+        
+        return [
+            self._format_result(
+                stat_type, line, over_prob,
+                self._analyze_factors(stat_type, line, features, season_avg)
+            )
+            for line, over_prob in zip(lines, over_probs)
+        ]
+    
+    def _normalize_stat_type(self, stat_type: str) -> str:
+        """Map common stat names onto STAT_TYPES"""
+        stat_type = stat_type.lower()
+        if stat_type not in self.STAT_TYPES:
+            stat_type = self.STAT_ALIASES.get(stat_type, stat_type)
+        return stat_type
+    
+    def _format_result(self, stat_type: str, line: float, over_prob: float, factors: Dict) -> Dict:
+        """Turn an over probability into a prediction result"""
+        over_prob = float(over_prob)
         
         # Determine prediction and confidence
         if over_prob >= 65:
@@ -237,9 +871,6 @@ class NBAStatPredictor:
             prediction = "push"
             confidence = "low"
         
-        # Identify key factors
-        factors = self._analyze_factors(stat_type, line, features[stat_type], season_avg)
-        
         return {
             "probability": round(over_prob, 1),
             "confidence": confidence,
@@ -253,65 +884,54 @@ class NBAStatPredictor:
         Fallback heuristic prediction when no ML model is available
         Uses statistical analysis of features
         """
-        season_avg = features[0]
-        recent_avg_5 = features[1]
-        recent_avg_3 = features[2]
-        max_recent = features[3]
-        min_recent = features[4]
-        std_recent = features[5]
-        trend = features[6]
-        is_home = features[7]
-        opp_def = features[8]
-        rest_days = features[9]
+        return float(self._heuristic_predict_batch(np.array([line]), features.reshape(1, -1))[0])
+    
+    def _heuristic_predict_batch(self, lines: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """
+        Vectorized heuristic over a feature matrix (one row per line)
+        Same rules as _heuristic_predict, applied column-wise
+        """
+        lines = np.asarray(lines, dtype=float)
+        X = np.asarray(X, dtype=float)
+        
+        season_avg = X[:, 0]
+        recent_avg_5 = X[:, 1]
+        recent_avg_3 = X[:, 2]
+        std_recent = X[:, 5]
+        trend = X[:, 6]
+        is_home = X[:, 7]
+        opp_def = X[:, 8]
+        rest_days = X[:, 9]
         
         # Base probability from comparing line to averages
         avg_of_avgs = (season_avg * 0.3 + recent_avg_5 * 0.4 + recent_avg_3 * 0.3)
         
         # How many standard deviations is the line from average?
-        if std_recent > 0:
-            z_score = (line - avg_of_avgs) / std_recent
-        else:
-            z_score = (line - avg_of_avgs) / max(avg_of_avgs * 0.15, 1)
+        scale = np.where(std_recent > 0, std_recent, np.maximum(avg_of_avgs * 0.15, 1))
+        z_score = (lines - avg_of_avgs) / scale
         
         # Convert z-score to probability (using sigmoid-like function)
         # Negative z-score = line below average = more likely to go over
         base_prob = 100 / (1 + np.exp(z_score * 1.5))
         
-        # Adjustments
-        adjustments = 0
-        
         # Trend adjustment (+/- 5%)
-        if trend > 0.1:
-            adjustments += 5
-        elif trend < -0.1:
-            adjustments -= 5
+        adjustments = np.where(trend > 0.1, 5.0, np.where(trend < -0.1, -5.0, 0.0))
         
         # Home court advantage (+3%)
-        if is_home:
-            adjustments += 3
+        adjustments += np.where(is_home != 0, 3.0, 0.0)
         
         # Rest days (well-rested = slight boost)
-        if rest_days >= 2:
-            adjustments += 2
-        elif rest_days == 0:
-            adjustments -= 3
+        adjustments += np.where(rest_days >= 2, 2.0, np.where(rest_days == 0, -3.0, 0.0))
         
         # Opponent defense (league avg ~110)
-        if opp_def > 115:  # Bad defense
-            adjustments += 4
-        elif opp_def < 105:  # Good defense
-            adjustments -= 4
-        
-        # Consistency bonus/penalty
-        if std_recent < avg_of_avgs * 0.1:  # Very consistent
-            # Move probability toward extremes (more confident)
-            if base_prob > 50:
-                adjustments += 3
-            else:
-                adjustments -= 3
+        adjustments += np.where(opp_def > 115, 4.0, np.where(opp_def < 105, -4.0, 0.0))
         
-        final_prob = np.clip(base_prob + adjustments, 5, 95)
-        return final_prob
+        # Consistency bonus/penalty: very consistent players move
+        # probability toward extremes (more confident)
+        consistent = std_recent < avg_of_avgs * 0.1
+        adjustments += np.where(consistent, np.where(base_prob > 50, 3.0, -3.0), 0.0)
+        
+        return np.clip(base_prob + adjustments, 5, 95)
     
     def _analyze_factors(
         self, 
@@ -368,7 +988,7 @@ class NBAStatPredictor:
         
         return factors
     
-    def train(self, training_data: pd.DataFrame, stat_type: str):
+    def train(self, training_data: pd.DataFrame, stat_type: str, backend: str = "gbm"):
         """
         Train model on historical data
         
@@ -377,52 +997,357 @@ class NBAStatPredictor:
         - 'actual': the actual stat value
         - 'line': the betting line
         - 'hit': 1 if actual > line, 0 otherwise
+        
+        The model is line-aware: 'line' and 'line_diff' (line minus
+        season average, derived if missing) are model inputs.
+        
+        backend: "gbm" (GradientBoostingClassifier) or "hist"
+        (HistGradientBoostingClassifier, much faster on large datasets)
         """
         if stat_type not in self.STAT_TYPES:
             raise ValueError(f"Unknown stat type: {stat_type}")
         
-        feature_cols = [
-            'season_avg', 'recent_avg_5', 'recent_avg_3', 'max_recent',
-            'min_recent', 'std_recent', 'trend', 'is_home', 
-            'opp_def_rating', 'rest_days', 'minutes_avg', 'usage_proxy'
-        ]
+        model, scaler, scores = _fit_stat_model(training_data, stat_type, backend)
+        self._store_trained(stat_type, model, scaler, scores)
+        self._save_models()
         
-        X = training_data[feature_cols].values
-        y = training_data['hit'].values
+        return scores
+    
+    def train_all(
+        self,
+        training_sets: Dict[str, pd.DataFrame],
+        backend: str = "gbm",
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Train several stat types in parallel across a process pool
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        training_sets: {stat_type: training DataFrame}, e.g. the output
+        of training_data.build_training_data(). Each worker gets an
+        equal share of the cores for the model's own threads. Only
+        artifacts whose contents changed are rewritten.
+        
+        Returns {stat_type: scores}.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        unknown = set(training_sets) - set(self.STAT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown stat type(s): {sorted(unknown)}")
+        
+        stats = [stat for stat in self.STAT_TYPES if stat in training_sets]
+        if not stats:
+            return {}
+        
+        cpus = os.cpu_count() or 1
+        max_workers = max_workers or min(len(stats), cpus)
+        n_threads = max(1, cpus // max_workers)
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                stat: pool.submit(_fit_stat_model, training_sets[stat], stat, backend, n_threads)
+                for stat in stats
+            }
+            for stat, future in futures.items():
+                model, scaler, scores = future.result()
+                self._store_trained(stat, model, scaler, scores)
+                results[stat] = scores
+        
+        self._save_models()
+        return results
+    
+    def partial_update(
+        self,
+        stat_type: str,
+        new_data: pd.DataFrame,
+        n_estimators: int = 10
+    ) -> Dict:
+        """
+        Fold new rows into an existing model without retraining
+        
+        Adds `n_estimators` boosting stages fitted on new_data (same
+        columns as train()) on top of the current ensemble, reusing the
+        existing scaler. The caller saves (see update_from_settled).
+        """
+        trained = self._get_model(stat_type)
+        if not trained:
+            raise ValueError(f"No trained model to update for {stat_type}")
+        
+        y = new_data['hit'].values
+        if len(np.unique(y)) < 2:
+            return {"stat_type": stat_type, "rows": len(y), "updated": False}
+        
+        model, scaler = trained
+        X_scaled = scaler.transform(self._training_matrix(new_data))
+        
+        # Refit a copy: the served model stays untouched until the swap
+        model = copy.deepcopy(model)
+        if hasattr(model, "max_iter"):
+            # HistGradientBoostingClassifier
+            model.set_params(warm_start=True, max_iter=model.max_iter + n_estimators)
+        else:
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + n_estimators)
+        model.fit(X_scaled, y)
+        
+        self._store_model(stat_type, model, scaler)
+        return {
+            "stat_type": stat_type,
+            "rows": len(y),
+            "updated": True,
+            "accuracy": model.score(X_scaled, y)
+        }
+    
+    def update_from_settled(
+        self,
+        settled_predictions: Union[pd.DataFrame, List[Dict]],
+        player_stats: Union[pd.DataFrame, List[Dict]],
+        n_estimators: int = 10
+    ) -> Dict:
+        """
+        Incrementally update models from newly settled predictions
+        
+        settled_predictions: rows from the predictions table (player_id,
+            game_date, stat_type, line, actual_value, settled_at); rows
+            settled at or before the stored watermark are skipped
+        player_stats: player_stats rows for those players covering the
+            season so far, used to rebuild point-in-time features
+        
+        Rows that could not be used yet (no model for the stat, no
+        matching player_stats row, or a batch with a single outcome)
+        are kept in the update state and retried on the next call,
+        until they are PENDING_MAX_DAYS older than the newest game.
+        
+        Updated artifacts are published with atomic renames before the
+        watermark advances. Returns {"watermark", "rows", "pending",
+        "stats": {...}}.
+        """
+        from .training_data import build_training_data
+        
+        state = self._read_update_state()
+        watermark = state.get("watermark")
+        pending = pd.DataFrame(state.get("pending", []), columns=self.PENDING_COLUMNS)
+        
+        settled = pd.DataFrame(settled_predictions)
+        if not settled.empty:
+            settled = settled[settled["actual_value"].notna()]
+            if watermark:
+                settled = settled[pd.to_datetime(settled["settled_at"], utc=True) > pd.Timestamp(watermark)]
+        if not settled.empty:
+            watermark = pd.to_datetime(settled["settled_at"], utc=True).max().isoformat()
+            settled = settled.assign(stat_type=settled["stat_type"].map(self._normalize_stat_type))
+            settled = settled[settled["stat_type"].isin(self.STAT_TYPES)][self.PENDING_COLUMNS]
+        new_rows = len(settled)
+        
+        settled = pd.concat([pending, settled], ignore_index=True) if new_rows else pending
+        if settled.empty:
+            return {"watermark": watermark, "rows": 0, "pending": 0, "stats": {}}
+        settled = settled.assign(game_date=pd.to_datetime(settled["game_date"]))
+        
+        stats = [stat for stat in self.STAT_TYPES if stat in set(settled["stat_type"])]
+        trained = [stat for stat in stats if self._get_model(stat)]
+        features = build_training_data(player_stats, trained, min_prior_games=1) if trained else {}
+        
+        results = {}
+        consumed = pd.Series(False, index=settled.index)
+        for stat in trained:
+            # Features for the predicted game, scored against the line that was offered
+            rows = settled[settled["stat_type"] == stat][["player_id", "game_date", "line", "actual_value"]]
+            base = features[stat].drop(columns=["line", "line_diff", "hit"])
+            new_data = base.merge(rows.reset_index(), on=["player_id", "game_date"], how="inner")
+            if new_data.empty:
+                continue
+            
+            new_data = new_data.assign(
+                line_diff=new_data["line"] - new_data["season_avg"],
+                hit=(new_data["actual_value"] > new_data["line"]).astype(int)
+            )
+            results[stat] = self.partial_update(stat, new_data, n_estimators)
+            if results[stat]["updated"]:
+                consumed[new_data["index"].unique()] = True
+        
+        self._save_models()
+        
+        # Keep what was not used, within the retry window
+        left = settled[~consumed]
+        cutoff = settled["game_date"].max() - pd.Timedelta(days=self.PENDING_MAX_DAYS)
+        left = left[left["game_date"] >= cutoff]
+        
+        state["watermark"] = watermark
+        state["rows"] = state.get("rows", 0) + int(consumed.sum())
+        state["pending"] = left.assign(
+            game_date=left["game_date"].dt.strftime("%Y-%m-%d"),
+            settled_at=left["settled_at"].astype(str)
+        ).to_dict("records")
+        self._write_update_state(state)
+        
+        return {
+            "watermark": watermark,
+            "rows": int(consumed.sum()),
+            "pending": len(left),
+            "stats": results
+        }
+    
+    def _read_update_state(self) -> Dict:
+        """Read the incremental-update watermark state"""
+        path = os.path.join(self._state_dir(), self.UPDATE_STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+    
+    def _write_update_state(self, state: Dict):
+        """Atomically write the incremental-update watermark state"""
+        os.makedirs(self._state_dir(), exist_ok=True)
+        path = os.path.join(self._state_dir(), self.UPDATE_STATE_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    
+    def _state_dir(self) -> str:
+        """Where the update watermark lives (registry versions are read-only)"""
+        return self.registry.root if self.registry is not None else self.model_path
+    
+    def _store_trained(self, stat_type: str, model, scaler, scores: Dict):
+        """Keep a freshly trained model and mark it for saving"""
+        print(f"Model trained for {stat_type}")
+        print(f"  Train accuracy: {scores['train_accuracy']:.3f}")
+        print(f"  Test accuracy: {scores['test_accuracy']:.3f}")
         
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
+        self._store_model(stat_type, model, scaler)
+    
+    def _store_model(self, stat_type: str, model, scaler):
+        """
+        Swap in a new model and scaler (and, if the stat has one, a
+        recompiled evaluator, so the old trees are never served) and
+        mark the stat for saving
+        """
+        compiled = None
+        if stat_type in self.compiled:
+            from .compiled_model import compile_model
+            compiled = {stat_type: compile_model(model, scaler)}
         
-        # Train model
+        self._publish(
+            models={stat_type: model},
+            scalers={stat_type: scaler},
+            compiled=compiled,
+            checked=[stat_type]
+        )
+        self._dirty.add(stat_type)
+
+
+def _is_missing(value) -> bool:
+    """True for None and NaN (empty DataFrame cells)"""
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _fingerprint(obj) -> str:
+    """
+    Content hash of a fitted model, scaler or bundle dict
+    
+    Arrays are hashed by dtype, shape and values, and objects through
+    their pickled state, so the hash depends only on what was fitted:
+    not on memory layout, object identity or how pickle memoized it.
+    """
+    digest = hashlib.sha256()
+    _feed_fingerprint(digest, obj)
+    return digest.hexdigest()
+
+
+def _feed_fingerprint(digest, obj):
+    if isinstance(obj, np.ndarray):
+        digest.update(f"ndarray:{obj.dtype.str}:{obj.shape}".encode())
+        if obj.dtype.hasobject:
+            for item in obj.ravel():
+                _feed_fingerprint(digest, item)
+        else:
+            digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        digest.update(f"{obj.dtype.str}:".encode() + obj.tobytes())
+    elif obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        digest.update(f"{type(obj).__name__}:{obj!r}".encode())
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _feed_fingerprint(digest, key)
+            _feed_fingerprint(digest, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"{type(obj).__name__}:{len(obj)}".encode())
+        for item in obj:
+            _feed_fingerprint(digest, item)
+    elif isinstance(obj, (set, frozenset)):
+        _feed_fingerprint(digest, sorted(obj, key=repr))
+    elif isinstance(obj, type) or callable(obj) and hasattr(obj, "__qualname__"):
+        digest.update(f"ref:{getattr(obj, '__module__', '')}.{obj.__qualname__}".encode())
+    else:
+        digest.update(f"object:{type(obj).__module__}.{type(obj).__qualname__}".encode())
+        state = obj.__getstate__() if hasattr(obj, "__getstate__") else None
+        if state is None:
+            # No Python-level state (e.g. extension types): pickled bytes
+            digest.update(pickle.dumps(obj, protocol=4))
+        else:
+            _feed_fingerprint(digest, state)
+
+
+def _fit_stat_model(
+    training_data: pd.DataFrame,
+    stat_type: str,
+    backend: str = "gbm",
+    n_threads: Optional[int] = None
+) -> Tuple:
+    """
+    Fit one stat's scaler and model (module-level so it can run in a
+    worker process). Returns (model, scaler, scores).
+    """
+    # sklearn is only needed for training; inference can run on
+    # compiled models without it
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+    from threadpoolctl import threadpool_limits
+    
+    X = NBAStatPredictor._training_matrix(training_data)
+    y = training_data['hit'].values
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+    
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    # Train model
+    if backend == "gbm":
+        from sklearn.ensemble import GradientBoostingClassifier
         model = GradientBoostingClassifier(
             n_estimators=100,
             max_depth=4,
             learning_rate=0.1,
             random_state=42
         )
+    elif backend == "hist":
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        model = HistGradientBoostingClassifier(
+            max_iter=200,
+            max_depth=6,
+            learning_rate=0.1,
+            early_stopping=False,
+            random_state=42
+        )
+    else:
+        raise ValueError(f"Unknown backend: {backend} (use 'gbm' or 'hist')")
+    
+    with threadpool_limits(limits=n_threads):
         model.fit(X_train_scaled, y_train)
         
         # Evaluate
         train_score = model.score(X_train_scaled, y_train)
         test_score = model.score(X_test_scaled, y_test)
-        
-        print(f"Model trained for {stat_type}")
-        print(f"  Train accuracy: {train_score:.3f}")
-        print(f"  Test accuracy: {test_score:.3f}")
-        
-        # Save
-        self.models[stat_type] = model
-        self.scalers[stat_type] = scaler
-        self._save_models()
-        
-        return {"train_accuracy": train_score, "test_accuracy": test_score}
+    
+    return model, scaler, {"train_accuracy": train_score, "test_accuracy": test_score}
 
 
 # Example usage
@@ -0,0 +1,278 @@
+"""
+Versioned Model Registry for NBA Player Props
+Immutable, checksummed model versions with atomic promotion and rollback
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+from .ml_model import NBAStatPredictor
+
+
+class ModelRegistry:
+    """
+    Model versions stored side by side under one root directory
+
+        root/
+          versions/<version>/   artifacts + manifest.json (never modified)
+          CURRENT               id of the version being served
+          history.json          promotion history (for rollback)
+
+    A version is staged in a temp directory and renamed into place, so
+    readers never see a half-written version. Promotion and rollback
+    only rewrite the CURRENT pointer (temp file + rename); predictors
+    built with `registry=` pick the new version up on their next call.
+
+        registry = ModelRegistry()
+        version = registry.publish(predictor)     # or a directory of artifacts
+        registry.promote(version)
+        registry.rollback()
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    POINTER_FILE = "CURRENT"
+    HISTORY_FILE = "history.json"
+    VERSIONS_DIR = "versions"
+
+    # Files copied into a version (besides the manifest)
+    ARTIFACT_SUFFIXES = (".pkl", ".npz")
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(os.path.dirname(__file__), "../ml/registry")
+        self.versions_dir = os.path.join(self.root, self.VERSIONS_DIR)
+
+        # Versions whose checksums have been verified by this instance
+        self._verified = set()
+
+    # ============== VERSIONS ==============
+
+    def versions(self) -> List[str]:
+        """Published version ids, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith(".")
+            and os.path.exists(os.path.join(self.versions_dir, name, self.MANIFEST_FILE))
+        )
+
+    def path(self, version: str) -> str:
+        """Directory holding a version's artifacts"""
+        return os.path.join(self.versions_dir, version)
+
+    def manifest(self, version: str) -> Dict:
+        """A version's manifest (files, checksums, stats, feature schema)"""
+        path = os.path.join(self.path(version), self.MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown model version: {version}")
+        with open(path) as f:
+            return json.load(f)
+
+    def current(self) -> Optional[str]:
+        """The version currently being served, or None"""
+        path = os.path.join(self.root, self.POINTER_FILE)
+        try:
+            with open(path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def history(self) -> List[Dict]:
+        """Promotion stack, oldest first ({version, promoted_at}); the last entry is CURRENT"""
+        path = os.path.join(self.root, self.HISTORY_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    # ============== PUBLISHING ==============
+
+    def publish(
+        self,
+        source: Union[str, NBAStatPredictor],
+        notes: Optional[str] = None,
+        promote: bool = False
+    ) -> str:
+        """
+        Snapshot artifacts into a new immutable version
+
+        source: a directory of saved artifacts (e.g. ml/models) or a
+            predictor, whose models are saved the way _save_models
+            would (plus compiled evaluators it has)
+
+        Returns the version id, `<UTC timestamp>-<content hash>`.
+        Publishing identical content twice returns the existing version.
+        """
+        os.makedirs(self.versions_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.versions_dir)
+        os.chmod(staging, 0o755)
+
+        try:
+            if isinstance(source, NBAStatPredictor):
+                self._stage_predictor(source, staging)
+            else:
+                self._stage_directory(source, staging)
+
+            files = {}
+            for name in sorted(os.listdir(staging)):
+                file_path = os.path.join(staging, name)
+                files[name] = {"sha256": _sha256(file_path), "bytes": os.path.getsize(file_path)}
+            if not any(name.endswith(self.ARTIFACT_SUFFIXES) for name in files):
+                raise ValueError("No model artifacts to publish")
+
+            content_hash = hashlib.sha256(
+                "".join(f"{name}:{info['sha256']}" for name, info in files.items()).encode()
+            ).hexdigest()
+
+            existing = [v for v in self.versions() if v.endswith(content_hash[:12])]
+            if existing:
+                shutil.rmtree(staging)
+                version = existing[-1]
+            else:
+                version = f"{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{content_hash[:12]}"
+                manifest = {
+                    "version": version,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "parent": self.current(),
+                    "notes": notes,
+                    "feature_schema_version": NBAStatPredictor.FEATURE_SCHEMA_VERSION,
+                    "feature_columns": NBAStatPredictor.FEATURE_COLUMNS + NBAStatPredictor.LINE_FEATURE_COLUMNS,
+                    "stats": _artifact_stats(files),
+                    "files": files
+                }
+                with open(os.path.join(staging, self.MANIFEST_FILE), "w") as f:
+                    json.dump(manifest, f, indent=2)
+
+                # The version appears all at once
+                os.rename(staging, self.path(version))
+                self._verified.add(version)
+                print(f"Published model version {version}")
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if promote:
+            self.promote(version)
+        return version
+
+    def _stage_directory(self, source: str, staging: str):
+        """Copy artifacts from a model directory"""
+        if not os.path.isdir(source):
+            raise ValueError(f"Model directory not found: {source}")
+        for name in os.listdir(source):
+            if name.endswith(self.ARTIFACT_SUFFIXES) or name == NBAStatPredictor.UPDATE_STATE_FILE:
+                shutil.copy2(os.path.join(source, name), os.path.join(staging, name))
+
+    @staticmethod
+    def _stage_predictor(predictor: NBAStatPredictor, staging: str):
+        """Write a predictor's models (and compiled evaluators) into staging"""
+        predictor._load_models()
+        predictor._load_pickled(NBAStatPredictor.STAT_TYPES)
+
+        staged = NBAStatPredictor(model_path=staging)
+        staged._publish(models=predictor.models, scalers=predictor.scalers)
+        staged._dirty = set(staged.models)
+        staged._save_models(bundle=False)
+
+        for stat, compiled in predictor.compiled.items():
+            if stat in staged.models:
+                staged.export_compiled([stat])
+            else:
+                compiled.save(os.path.join(staging, f"{stat}_compiled.npz"))
+
+        state = predictor._read_update_state()
+        if state:
+            staged._write_update_state(state)
+
+    # ============== PROMOTION ==============
+
+    def verify(self, version: str) -> Dict:
+        """
+        Check a version's files against its manifest checksums and
+        feature schema; raises ValueError on any mismatch, or if the
+        version holds files its manifest does not list (a predictor
+        would load an unverified artifact). Returns the manifest.
+        """
+        manifest = self.manifest(version)
+        schema = manifest.get("feature_schema_version")
+        if schema != NBAStatPredictor.FEATURE_SCHEMA_VERSION:
+            raise ValueError(
+                f"Model version {version} uses feature schema {schema}, "
+                f"this code expects {NBAStatPredictor.FEATURE_SCHEMA_VERSION}"
+            )
+
+        unlisted = sorted(
+            set(os.listdir(self.path(version))) - set(manifest["files"]) - {self.MANIFEST_FILE}
+        )
+        if unlisted:
+            raise ValueError(f"Model version {version}: files not in manifest: {', '.join(unlisted)}")
+
+        if version not in self._verified:
+            for name, info in manifest["files"].items():
+                file_path = os.path.join(self.path(version), name)
+                if not os.path.exists(file_path) or _sha256(file_path) != info["sha256"]:
+                    raise ValueError(f"Model version {version}: checksum mismatch for {name}")
+            self._verified.add(version)
+        return manifest
+
+    def promote(self, version: str):
+        """Verify a version and atomically point CURRENT at it"""
+        self.verify(version)
+        self._write_atomic(self.POINTER_FILE, version)
+
+        history = self.history()
+        history.append({"version": version, "promoted_at": datetime.now(timezone.utc).isoformat()})
+        self._write_atomic(self.HISTORY_FILE, json.dumps(history, indent=2))
+        print(f"Promoted model version {version}")
+
+    def rollback(self, steps: int = 1) -> str:
+        """
+        Point CURRENT back at the version promoted `steps` promotions
+        earlier, dropping the newer promotions from the history
+        """
+        history = self.history()
+        if len(history) <= steps:
+            raise ValueError("No earlier model version to roll back to")
+
+        target = history[-1 - steps]["version"]
+        self.verify(target)
+        self._write_atomic(self.POINTER_FILE, target)
+        self._write_atomic(self.HISTORY_FILE, json.dumps(history[:-steps], indent=2))
+        print(f"Rolled back to model version {target}")
+        return target
+
+    def _write_atomic(self, name: str, content: str):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _artifact_stats(files: Dict) -> Dict[str, List[str]]:
+    """{stat: artifact kinds} from artifact file names"""
+    stats = {}
+    for stat in NBAStatPredictor.STAT_TYPES:
+        kinds = [
+            kind for kind in ("model", "scaler", "compiled")
+            if any(name.startswith(f"{stat}_{kind}.") for name in files)
+        ]
+        if kinds:
+            stats[stat] = kinds
+    if NBAStatPredictor.BUNDLE_FILE in files:
+        stats["bundle"] = [NBAStatPredictor.BUNDLE_FILE]
+    return stats
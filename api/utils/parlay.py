@@ -0,0 +1,271 @@
+"""
+Monte Carlo Parlay Engine for NBA Player Props
+Prices parlays by simulating correlated leg outcomes in batched NumPy draws
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, List, Optional, Union
+
+from .ml_model import NBAStatPredictor
+from .training_data import STAT_COLUMNS
+
+
+_NORMAL = NormalDist()
+
+
+class ParlayEngine:
+    """
+    Prices a parlay with a Gaussian copula over its legs
+
+    Each leg's stat is a standard normal latent variable; an OVER leg
+    hits when its latent is above the quantile matching the leg's
+    probability, an UNDER leg when it is below. Latents are correlated
+    by leg relationship (same player, teammates, opponents, different
+    games), using correlations measured from shared games in
+    player_stats where available, shrunk toward league-wide defaults.
+
+    Legs use the frontend's shape; player_id and team are optional but
+    improve same-game detection and history lookups:
+
+        engine = ParlayEngine()
+        engine.price(legs, player_stats=db.get_stats_for_players(ids))
+    """
+
+    # Prior stat-outcome correlations by leg relationship
+    DEFAULT_CORRELATION = {
+        "same_player": 0.45,
+        "teammates": -0.05,
+        "opponents": 0.05
+    }
+
+    # Shared games needed before measured correlation outweighs the prior
+    SHRINKAGE_GAMES = 20
+
+    # Recent games used for a leg's own distribution when it has no probability
+    MARGINAL_GAMES = 20
+
+    # Simulations drawn per batch (bounds memory for large n_sims)
+    BATCH_SIZE = 50000
+
+    def __init__(self, n_sims: int = 20000, seed: Optional[int] = None):
+        self.n_sims = n_sims
+        self.rng = np.random.default_rng(seed)
+
+    # ============== PRICING ==============
+
+    def price(
+        self,
+        legs: List[Dict],
+        player_stats: Optional[Union[pd.DataFrame, List[Dict]]] = None
+    ) -> Dict:
+        """
+        Combined probability for a parlay
+
+        legs: dicts with player, stat, line, direction (OVER/UNDER),
+            opponent and probability (0-100); player_id and team are
+            optional. Legs without a probability need player_id and
+            history in player_stats.
+        player_stats: raw player_stats rows for the legs' players
+
+        Returns combined_probability and implied_odds (same format as
+        the Claude parlay response) plus independent_probability,
+        std_error, correlation matrix and a correlation_warning.
+        """
+        legs = [self._normalize_leg(leg) for leg in legs]
+        history = self._stat_history(legs, player_stats)
+
+        probs = np.array([self._leg_probability(leg, history) for leg in legs])
+        correlation, relations = self._correlation_matrix(legs, history)
+
+        independent = float(np.prod(probs))
+        if relations:
+            combined = self.simulate(probs, correlation, [leg["over"] for leg in legs])
+            std_error = math.sqrt(combined * (1 - combined) / self.n_sims)
+        else:
+            # Independent legs: the product is exact, no simulation needed
+            combined, std_error = independent, 0.0
+
+        combined_pct = round(combined * 100, 1)
+        return {
+            "combined_probability": combined_pct,
+            "implied_odds": implied_odds(combined_pct),
+            "independent_probability": round(independent * 100, 1),
+            "std_error": round(std_error * 100, 2),
+            "leg_probabilities": [round(float(p) * 100, 1) for p in probs],
+            "correlation": np.round(correlation, 3).tolist(),
+            "analysis": self._summary(combined, independent, std_error, len(legs)),
+            "correlation_warning": self._correlation_warning(legs, relations),
+            "simulations": self.n_sims
+        }
+
+    def simulate(self, probs: np.ndarray, correlation: np.ndarray, over: List[bool]) -> float:
+        """Fraction of simulated slates where every leg hits"""
+        probs = np.clip(np.asarray(probs, dtype=np.float64), 1e-6, 1 - 1e-6)
+        thresholds = np.array([_NORMAL.inv_cdf(p) for p in probs])
+
+        # An OVER leg hits when -Z < Φ⁻¹(p), an UNDER leg when Z < Φ⁻¹(p)
+        signs = np.where(over, -1.0, 1.0)
+        chol = np.linalg.cholesky(_nearest_correlation(correlation))
+
+        hits = 0
+        remaining = self.n_sims
+        while remaining > 0:
+            size = min(remaining, self.BATCH_SIZE)
+            z = self.rng.standard_normal((size, len(probs))) @ chol.T
+            hits += int(np.count_nonzero(((z * signs) < thresholds).all(axis=1)))
+            remaining -= size
+        return hits / self.n_sims
+
+    # ============== LEGS ==============
+
+    @staticmethod
+    def _normalize_leg(leg: Dict) -> Dict:
+        stat = str(leg.get("stat", "points")).lower()
+        stat = NBAStatPredictor.STAT_ALIASES.get(stat, stat)
+        if stat not in NBAStatPredictor.STAT_TYPES:
+            raise ValueError(f"Unknown stat type: {leg.get('stat')}")
+
+        probability = leg.get("probability")
+        return {
+            "player": leg.get("player"),
+            "player_id": leg.get("player_id"),
+            "team": leg.get("team"),
+            "opponent": leg.get("opponent"),
+            "stat": stat,
+            "line": float(leg.get("line", 0)),
+            "over": str(leg.get("direction", "OVER")).upper() == "OVER",
+            "probability": None if probability is None else float(probability) / 100
+        }
+
+    def _leg_probability(self, leg: Dict, history: Optional[pd.DataFrame]) -> float:
+        """Leg probability as given, else from the player's recent stat distribution"""
+        if leg["probability"] is not None:
+            return leg["probability"]
+
+        values = self._player_values(leg, history)
+        if values is None or len(values) < 2:
+            raise ValueError(f"No probability or game history for {leg['player']} {leg['stat']}")
+
+        recent = values.iloc[-self.MARGINAL_GAMES:]
+        std = max(float(recent.std(ddof=0)), 1.0)
+        # Stats are integers: OVER needs at least the next whole number
+        p_over = 1 - _NORMAL.cdf((math.floor(leg["line"]) + 0.5 - float(recent.mean())) / std)
+        return p_over if leg["over"] else 1 - p_over
+
+    @staticmethod
+    def _relation(a: Dict, b: Dict) -> Optional[str]:
+        """How two legs are linked: same_player, teammates, opponents or None"""
+        if (a["player_id"] and a["player_id"] == b["player_id"]) or (a["player"] and a["player"] == b["player"]):
+            return "same_player"
+        if a["team"] and b["team"]:
+            if a["team"] == b["team"]:
+                return "teammates"
+            if a["team"] == b["opponent"] or a["opponent"] == b["team"]:
+                return "opponents"
+            return None
+        # Without teams, a shared opponent is the best same-game signal
+        if a["opponent"] and a["opponent"] == b["opponent"]:
+            return "teammates"
+        return None
+
+    # ============== CORRELATION ==============
+
+    @staticmethod
+    def _stat_history(legs: List[Dict], player_stats) -> Optional[pd.DataFrame]:
+        """player_stats rows for the legs' players with a column per stat type"""
+        if player_stats is None or not any(leg["player_id"] for leg in legs):
+            return None
+        df = pd.DataFrame(player_stats)
+        if df.empty or not {"player_id", "game_id"}.issubset(df.columns):
+            return None
+
+        if "game_date" in df.columns:
+            df = df.sort_values("game_date", kind="stable")
+        out = df[["player_id", "game_id"]].copy()
+        for stat in {leg["stat"] for leg in legs}:
+            columns = [c for c in STAT_COLUMNS[stat] if c in df.columns]
+            if len(columns) == len(STAT_COLUMNS[stat]):
+                out[stat] = df[columns].fillna(0).astype(float).sum(axis=1)
+        return out
+
+    @staticmethod
+    def _player_values(leg: Dict, history: Optional[pd.DataFrame]) -> Optional[pd.Series]:
+        """A leg's stat per game, indexed by game_id"""
+        if history is None or not leg["player_id"] or leg["stat"] not in history.columns:
+            return None
+        rows = history[history["player_id"] == leg["player_id"]]
+        return rows.drop_duplicates("game_id", keep="last").set_index("game_id")[leg["stat"]]
+
+    def _correlation_matrix(self, legs: List[Dict], history: Optional[pd.DataFrame]):
+        """Pairwise latent correlations and the relation behind each pair"""
+        n = len(legs)
+        correlation = np.eye(n)
+        relations = {}
+        values = [self._player_values(leg, history) for leg in legs]
+
+        for i in range(n):
+            for j in range(i + 1, n):
+                relation = self._relation(legs[i], legs[j])
+                if relation is None:
+                    continue
+                relations[(i, j)] = relation
+
+                rho = self.DEFAULT_CORRELATION[relation]
+                if values[i] is not None and values[j] is not None:
+                    shared = pd.concat([values[i], values[j]], axis=1, join="inner").to_numpy()
+                    if len(shared) > 2 and shared.std(axis=0).min() > 0:
+                        measured = float(np.corrcoef(shared[:, 0], shared[:, 1])[0, 1])
+                        weight = len(shared) / (len(shared) + self.SHRINKAGE_GAMES)
+                        rho = weight * measured + (1 - weight) * rho
+
+                correlation[i, j] = correlation[j, i] = rho
+
+        return correlation, relations
+
+    # ============== SUMMARY ==============
+
+    @staticmethod
+    def _correlation_warning(legs: List[Dict], relations: Dict) -> Optional[str]:
+        if not relations:
+            return None
+        counts = {}
+        for relation in relations.values():
+            counts[relation] = counts.get(relation, 0) + 1
+        labels = {
+            "same_player": "same-player",
+            "teammates": "teammate",
+            "opponents": "opposing-player"
+        }
+        parts = [f"{count} {labels[relation]} pair{'s' if count > 1 else ''}" for relation, count in counts.items()]
+        return f"Correlated legs: {', '.join(parts)}. Combined probability accounts for same-game correlation."
+
+    @staticmethod
+    def _summary(combined: float, independent: float, std_error: float, n_legs: int) -> str:
+        diff = (combined - independent) * 100
+        if abs(diff) <= max(2 * std_error * 100, 0.1):
+            effect = "Legs are effectively independent"
+        elif diff > 0:
+            effect = f"Correlation lifts it {diff:.1f} points above independent legs"
+        else:
+            effect = f"Correlation drops it {-diff:.1f} points below independent legs"
+        return f"{n_legs}-leg parlay hits {combined * 100:.1f}% of the time. {effect} ({independent * 100:.1f}%)."
+
+
+def implied_odds(combined_probability: float) -> str:
+    """Payout odds for a win probability (percent), as the frontend displays them"""
+    if combined_probability <= 0:
+        return "9999"
+    return str(round((100 / combined_probability - 1) * 100))
+
+
+def _nearest_correlation(matrix: np.ndarray, floor: float = 1e-6) -> np.ndarray:
+    """Clip eigenvalues so the matrix is positive definite, keeping a unit diagonal"""
+    values, vectors = np.linalg.eigh((matrix + matrix.T) / 2)
+    if values.min() >= floor:
+        return matrix
+    fixed = vectors @ np.diag(np.maximum(values, floor)) @ vectors.T
+    d = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(d, d)
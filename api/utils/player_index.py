@@ -0,0 +1,320 @@
+"""
+In-Memory Player Search Index
+Accent-insensitive prefix and fuzzy player-name search for typeahead
+"""
+
+import re
+import time
+import heapq
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """
+    Fold a name for matching: accents stripped, case-folded, apostrophes
+    and periods dropped, other punctuation as spaces ("D'Angelo",
+    "Dončić" -> "dangelo", "doncic")
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = re.sub(r"['’.]", "", text)
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+
+def _trigrams(name: str) -> Set[str]:
+    grams = set()
+    for token in name.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+class PlayerSearchIndex:
+    """
+    Player typeahead answered from memory
+
+    Every name token goes into a prefix trie whose nodes hold the ids
+    below them, so "leb ja" is two dict walks and a set intersection.
+    When prefixes find fewer than k players, trigram similarity fills
+    in misspellings ("giannis antetokounpo"). Names are normalized by
+    normalize_name, so accents and case never matter.
+
+    Built from the players table and kept current with refresh(), which
+    only pulls rows updated since the last refresh:
+
+        index = get_player_index()
+        index.search("jokic", k=5)
+    """
+
+    # Minimum Dice similarity of trigrams for a fuzzy match
+    FUZZY_THRESHOLD = 0.4
+
+    # Recent results kept (typeahead repeats short prefixes constantly)
+    RESULT_CACHE_SIZE = 512
+
+    def __init__(self, players: Optional[Iterable[Dict]] = None):
+        self._root = _TrieNode()
+        self._grams: Dict[str, Set[int]] = {}
+        self._entries: Dict[int, Dict] = {}
+        self._names: Dict[int, str] = {}
+        self._tokens: Dict[int, frozenset] = {}
+        self._results: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        self._gram_counts: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+        # Newest players.updated_at seen (server clock, for refresh())
+        self.synced_until: Optional[str] = None
+        self.refreshed_at = 0.0
+
+        if players:
+            self.add_many(players)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._entries
+
+    # ============== UPDATES ==============
+
+    def add(self, player: Dict) -> bool:
+        """
+        Add or update a player (players table or API-Sports row); returns
+        False if the row has no id or name
+        """
+        entry = _player_entry(player)
+        if entry is None:
+            return False
+        with self._lock:
+            if entry["id"] in self._entries:
+                self.remove(entry["id"])
+
+            name = normalize_name(entry["name"])
+            player_id = entry["id"]
+            self._entries[player_id] = entry
+            self._names[player_id] = name
+            self._tokens[player_id] = frozenset(name.split())
+            self._results.clear()
+
+            for token in set(name.split()):
+                node = self._root
+                for ch in token:
+                    node = node.children.setdefault(ch, _TrieNode())
+                    node.ids.add(player_id)
+
+            grams = _trigrams(name)
+            self._gram_counts[player_id] = len(grams)
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(player_id)
+        return True
+
+    def add_many(self, players: Iterable[Dict]) -> int:
+        with self._lock:
+            return sum(self.add(player) for player in players)
+
+    def remove(self, player_id: int) -> bool:
+        with self._lock:
+            if self._entries.pop(player_id, None) is None:
+                return False
+            name = self._names.pop(player_id)
+            self._tokens.pop(player_id, None)
+            self._gram_counts.pop(player_id, None)
+            self._results.clear()
+
+            for token in set(name.split()):
+                path = [(None, self._root)]
+                for ch in token:
+                    path.append((ch, path[-1][1].children[ch]))
+                    path[-1][1].ids.discard(player_id)
+                # Prune branches no player uses any more
+                for (ch, node), (_, parent) in zip(reversed(path[1:]), reversed(path[:-1])):
+                    if node.ids:
+                        break
+                    del parent.children[ch]
+
+            for gram in _trigrams(name):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(player_id)
+                    if not ids:
+                        del self._grams[gram]
+            return True
+
+    def refresh(self, db=None) -> int:
+        """
+        Pull players updated since the last refresh (everything the first
+        time) into the index; returns how many rows changed
+        """
+        if db is None:
+            from .database import get_db
+            db = get_db()
+        rows = db.get_players(updated_since=self.synced_until)
+        with self._lock:
+            changed = self.add_many(rows)
+            stamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+            if stamps:
+                self.synced_until = max(stamps + ([self.synced_until] if self.synced_until else []))
+            self.refreshed_at = time.time()
+        return changed
+
+    # ============== SEARCH ==============
+
+    def search(self, query: str, k: int = 10, fuzzy: bool = True) -> List[Dict]:
+        """
+        Top-k players for a partial name
+
+        Every query word must start some word of the name. Matches rank
+        by: whole name starts with the query, then words matched
+        exactly, then shorter names. Fuzzy matches come after all
+        prefix matches.
+        """
+        terms = normalize_name(query)
+        if not terms or k <= 0:
+            return []
+
+        with self._lock:
+            key = (terms, k, fuzzy)
+            best = self._results.get(key)
+            if best is None:
+                best = self._rank(terms, k, fuzzy)
+                self._results[key] = best
+                if len(self._results) > self.RESULT_CACHE_SIZE:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+            return [dict(self._entries[player_id]) for player_id in best]
+
+    def _rank(self, terms: str, k: int, fuzzy: bool) -> List[int]:
+        """Ids of the top-k matches (see search)"""
+        tokens = terms.split()
+        candidates = None
+        for token in tokens:
+            ids = self._prefix(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        candidates = candidates or set()
+
+        names, name_tokens = self._names, self._tokens
+        exact = frozenset(tokens)
+
+        def rank(player_id):
+            name = names[player_id]
+            return (
+                not name.startswith(terms),
+                -len(exact & name_tokens[player_id]),
+                len(name),
+                name
+            )
+
+        best = heapq.nsmallest(k, candidates, key=rank)
+        if fuzzy and len(best) < k:
+            best += self._fuzzy(terms, k - len(best), exclude=candidates)
+        return best
+
+    def _prefix(self, token: str) -> Set[int]:
+        node = self._root
+        for ch in token:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.ids
+
+    def _fuzzy(self, terms: str, k: int, exclude: Set[int]) -> List[int]:
+        """Players whose name trigrams are most similar (Dice) to the query's"""
+        grams = _trigrams(terms)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+
+        scored = []
+        for player_id, count in shared.items():
+            if player_id in exclude:
+                continue
+            score = 2 * count / (len(grams) + self._gram_counts[player_id])
+            if score >= self.FUZZY_THRESHOLD:
+                scored.append((-score, self._names[player_id], player_id))
+        return [player_id for _, _, player_id in heapq.nsmallest(k, scored)]
+
+
+def _player_entry(player: Dict) -> Optional[Dict]:
+    """Search result for a players table row or an API-Sports player"""
+    player_id = player.get("id")
+    first = player.get("first_name", player.get("firstname")) or ""
+    last = player.get("last_name", player.get("lastname")) or ""
+    name = player.get("full_name") or f"{first} {last}".strip()
+    if not player_id or not name:
+        return None
+
+    team = player.get("team")
+    standard = (player.get("leagues") or {}).get("standard") or {}
+    return {
+        "id": player_id,
+        "name": name,
+        "team": player.get("team_name") or (team.get("name") if isinstance(team, dict) else None),
+        "position": player.get("position") or standard.get("pos"),
+        "jersey": player["jersey_number"] if player.get("jersey_number") is not None else standard.get("jersey")
+    }
+
+
+# Process-wide index, reused across warm invocations
+_index: Optional[PlayerSearchIndex] = None
+_index_built_at = 0.0
+_index_refreshing = False
+_index_lock = threading.Lock()
+
+
+def get_player_index(max_age: float = 300.0, rebuild_every: float = 3600.0) -> PlayerSearchIndex:
+    """
+    Shared index built from the players table
+
+    Refreshed incrementally when older than max_age seconds, and rebuilt
+    from scratch every rebuild_every seconds, which drops players deleted
+    from the table (incremental refreshes only see inserts and updates).
+    Only the first build blocks; afterwards one caller fetches outside
+    the lock while the others keep searching the current index, and a
+    failed refresh is logged and the current index served.
+    """
+    global _index, _index_built_at, _index_refreshing
+    with _index_lock:
+        if _index is None:
+            index = PlayerSearchIndex()
+            index.refresh()
+            _index, _index_built_at = index, time.time()
+            return _index
+
+        index = _index
+        if _index_refreshing or time.time() - index.refreshed_at <= max_age:
+            return index
+        rebuild = time.time() - _index_built_at > rebuild_every
+        _index_refreshing = True
+
+    fresh = None
+    try:
+        if rebuild:
+            fresh = PlayerSearchIndex()
+            fresh.refresh()
+        else:
+            index.refresh()
+    except Exception as e:
+        fresh = None
+        print(f"Player index refresh failed: {e}")
+    finally:
+        with _index_lock:
+            if fresh is not None:
+                _index, _index_built_at = fresh, time.time()
+            _index_refreshing = False
+    return _index
@@ -0,0 +1,235 @@
+"""
+Quota-Aware Request Scheduler for API-Sports
+Token-bucket admission with priorities, fed by the API's rate-limit headers
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+
+class QuotaExhausted(Exception):
+    """No quota left for a request at its priority (or the wait timed out)"""
+
+
+class QuotaScheduler:
+    """
+    Admits API-Sports requests within the per-minute and per-day quotas
+
+    Per-minute quota is a token bucket refilled continuously; the daily
+    quota is a counter that resets at midnight UTC. Both limits start
+    unknown (no throttling) unless given, and are learned from the
+    x-ratelimit-* response headers.
+
+    Waiting requests are served strictly by priority, so an interactive
+    lookup jumps every queued background request. Background requests
+    also leave `reserve_fraction` of each quota untouched, so a
+    backfill can never starve user-facing traffic.
+
+        scheduler = QuotaScheduler(per_minute=10, per_day=100)
+        scheduler.acquire(QuotaScheduler.BACKGROUND)
+        scheduler.update_from_headers(response.headers)
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+    def __init__(
+        self,
+        per_minute: Optional[int] = None,
+        per_day: Optional[int] = None,
+        reserve_fraction: float = 0.2
+    ):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.reserve_fraction = reserve_fraction
+
+        self.tokens = float(per_minute) if per_minute else 0.0
+        self.daily_remaining = per_day
+        self._refilled_at = time.monotonic()
+        self._day = _utc_today()
+        self._paused_until = 0.0
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+
+        self.granted = 0
+        self.waited_seconds = 0.0
+
+    # ============== ADMISSION ==============
+
+    def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None):
+        """
+        Block until a request at `priority` may be sent, then consume
+        one unit of quota. Raises QuotaExhausted if the daily quota is
+        spent for this priority or the wait exceeds `timeout`.
+        """
+        started = time.monotonic()
+        ticket = (priority, next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    wait = self._wait_time(priority) if self._waiters[0] == ticket else None
+
+                    if wait == 0:
+                        heapq.heappop(self._waiters)
+                        if self.per_minute:
+                            self.tokens -= 1
+                        if self.daily_remaining is not None:
+                            self.daily_remaining -= 1
+                        self.granted += 1
+                        self.waited_seconds += time.monotonic() - started
+                        self._cond.notify_all()
+                        return
+                    if wait == math.inf:
+                        raise QuotaExhausted("Daily API-Sports quota exhausted for this priority")
+
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0:
+                            raise QuotaExhausted(f"Waited {timeout}s for API-Sports quota")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def _wait_time(self, priority: int) -> float:
+        """Seconds until the head request may go (0 = now, inf = not today)"""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        background = priority > self.INTERACTIVE
+        if self.daily_remaining is not None:
+            floor = self._reserve(self.per_day) if background else 0
+            if self.daily_remaining <= floor:
+                return math.inf
+
+        if self.per_minute:
+            floor = self._reserve(self.per_minute) if background else 0
+            if self.tokens < floor + 1:
+                return (floor + 1 - self.tokens) * 60 / self.per_minute
+        return 0.0
+
+    def _reserve(self, limit: Optional[int]) -> int:
+        """Quota units kept back from background requests"""
+        return math.ceil(limit * self.reserve_fraction) if limit else 0
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.per_minute:
+            elapsed = now - self._refilled_at
+            self.tokens = min(float(self.per_minute), self.tokens + elapsed * self.per_minute / 60)
+        self._refilled_at = now
+
+        today = _utc_today()
+        if today != self._day:
+            self._day = today
+            self.daily_remaining = self.per_day
+
+    # ============== FEEDBACK ==============
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Sync limits and remaining quota with API-Sports' headers:
+        x-ratelimit-requests-limit/-remaining (daily) and
+        x-ratelimit-limit/-remaining (per minute)
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        with self._cond:
+            self._refill()
+
+            day_limit = _int(headers.get("x-ratelimit-requests-limit"))
+            day_remaining = _int(headers.get("x-ratelimit-requests-remaining"))
+            if day_limit:
+                self.per_day = day_limit
+            if day_remaining is not None:
+                self.daily_remaining = day_remaining
+
+            minute_limit = _int(headers.get("x-ratelimit-limit"))
+            minute_remaining = _int(headers.get("x-ratelimit-remaining"))
+            if minute_limit and minute_limit != self.per_minute:
+                if not self.per_minute:
+                    self.tokens = float(minute_limit)
+                self.per_minute = minute_limit
+            if minute_remaining is not None and self.per_minute:
+                self.tokens = min(self.tokens, float(minute_remaining))
+
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds` (after a 429)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    # ============== PLANNING ==============
+
+    def estimate(self, calls: int, priority: int = BACKGROUND) -> Dict:
+        """
+        Dry-run estimate for a job of `calls` upstream requests at
+        `priority`: whether today's quota covers it and roughly how long
+        the per-minute limit makes it take (ignoring other traffic)
+        """
+        with self._cond:
+            self._refill()
+            background = priority > self.INTERACTIVE
+
+            if self.daily_remaining is None:
+                available = None
+            else:
+                floor = self._reserve(self.per_day) if background else 0
+                available = max(self.daily_remaining - floor, 0)
+
+            seconds = 0.0
+            if self.per_minute:
+                floor = self._reserve(self.per_minute) if background else 0
+                ready = max(int(self.tokens) - floor, 0)
+                rate = self.per_minute if not background else max(self.per_minute - floor, 1)
+                seconds = max(calls - ready, 0) * 60 / rate
+
+            return {
+                "calls": calls,
+                "available_today": available,
+                "fits_quota": available is None or calls <= available,
+                "estimated_seconds": round(seconds, 1),
+                "per_minute": self.per_minute,
+                "per_day": self.per_day
+            }
+
+    def status(self) -> Dict:
+        """Current quota view"""
+        with self._cond:
+            self._refill()
+            return {
+                "per_minute": self.per_minute,
+                "per_day": self.per_day,
+                "tokens": round(self.tokens, 2) if self.per_minute else None,
+                "daily_remaining": self.daily_remaining,
+                "queued": len(self._waiters),
+                "granted": self.granted,
+                "waited_seconds": round(self.waited_seconds, 3)
+            }
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc_today():
+    return datetime.now(timezone.utc).date()
@@ -0,0 +1,236 @@
+"""
+Record/Replay Stand-In for API-Sports
+Captures real API-Sports responses to disk and serves them back locally
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def recording_key(endpoint: str, params: List[Tuple[str, str]]) -> str:
+    """Stable file key for an endpoint and its query parameters"""
+    canonical = json.dumps([endpoint.strip("/"), sorted(params)])
+    return hashlib.sha1(canonical.encode()).hexdigest()[:20]
+
+
+def _split_url(url: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """(endpoint, query params) of a request URL"""
+    parts = urlsplit(url)
+    return parts.path.strip("/"), parse_qsl(parts.query, keep_blank_values=True)
+
+
+class ResponseRecorder:
+    """
+    Recorded responses on disk, one JSON file per (endpoint, params)
+
+    Layout: <directory>/<endpoint>/<key>.json holding the endpoint,
+    params, HTTP status, upstream latency and the response body.
+    Credentials are never written.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, endpoint: str, params: List[Tuple[str, str]]) -> str:
+        folder = endpoint.strip("/").replace("/", "_") or "_root"
+        return os.path.join(self.directory, folder, f"{recording_key(endpoint, params)}.json")
+
+    def save(self, endpoint: str, params: List[Tuple[str, str]], status: int, body: str, elapsed: float):
+        path = self.path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+        record = {
+            "endpoint": endpoint.strip("/"),
+            "params": sorted(params),
+            "status": status,
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time(),
+            "body": body
+        }
+        # Write then rename, so a concurrent replay never reads half a file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+    def load(self, endpoint: str, params: List[Tuple[str, str]]) -> Optional[Dict]:
+        try:
+            with open(self.path(endpoint, params)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def __len__(self) -> int:
+        count = 0
+        for _, _, files in os.walk(self.directory):
+            count += sum(1 for name in files if name.endswith(".json"))
+        return count
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that saves every successful response it sends"""
+
+    def __init__(self, recorder: ResponseRecorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            body = response.text  # reads the body, so it counts toward the latency
+            endpoint, params = _split_url(request.url)
+            self.recorder.save(endpoint, params, response.status_code, body, time.perf_counter() - started)
+        return response
+
+
+def recording_session(directory: str) -> requests.Session:
+    """A pooled session that records API-Sports responses into `directory`"""
+    session = requests.Session()
+    adapter = RecordingAdapter(ResponseRecorder(directory), pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ReplayServer:
+    """
+    Local HTTP server answering API-Sports requests from recordings
+
+    Point a client at it with APISportsClient(base_url=server.url) or
+    API_SPORTS_BASE_URL. Requests without a recording get a 404 with
+    an API-style errors payload. Every response is delayed by
+    `latency` plus up to `jitter` seconds, or by the latency measured
+    when it was recorded (recorded_latency=True) times `latency_scale`.
+
+        with ReplayServer("recordings/", latency=0.08, jitter=0.04) as server:
+            client = APISportsClient(base_url=server.url)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        recorded_latency: bool = False,
+        latency_scale: float = 1.0
+    ):
+        self.recorder = ResponseRecorder(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_latency = recorded_latency
+        self.latency_scale = latency_scale
+
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """Serve on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="api-sports-replay")
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _delay(self, record: Optional[Dict]) -> float:
+        if self.recorded_latency and record is not None:
+            delay = record.get("elapsed", 0.0) * self.latency_scale
+        else:
+            delay = self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        return delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                endpoint, params = _split_url(self.path)
+                record = server.recorder.load(endpoint, params)
+                with server._counter_lock:
+                    if record is None:
+                        server.misses += 1
+                    else:
+                        server.hits += 1
+
+                delay = server._delay(record)
+                if delay > 0:
+                    time.sleep(delay)
+
+                if record is None:
+                    status = 404
+                    body = {"errors": {"replay": f"No recording for {endpoint} {params}"}, "response": []}
+                else:
+                    status, body = record["status"], record["body"]
+                payload = (body if isinstance(body, str) else json.dumps(body)).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded API-Sports responses")
+    parser.add_argument("directory")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds")
+    parser.add_argument("--recorded-latency", action="store_true", help="replay the latency measured when recording")
+    args = parser.parse_args()
+
+    replay = ReplayServer(
+        args.directory, port=args.port, latency=args.latency,
+        jitter=args.jitter, recorded_latency=args.recorded_latency
+    )
+    print(f"Replaying {len(replay.recorder)} recordings from {args.directory} at {replay.url}")
+    replay.serve_forever()
@@ -0,0 +1,179 @@
+"""
+Tiered Response Cache for API-Sports
+In-process LRU in front of a persistent SQLite store, with TTLs and stale windows
+"""
+
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheEntry:
+    """A cached payload and its freshness deadlines (None = never expires)"""
+
+    __slots__ = ("data", "stored_at", "expires_at", "stale_until")
+
+    def __init__(self, data: Any, stored_at: float, expires_at: Optional[float], stale_until: Optional[float]):
+        self.data = data
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is None or (now or time.time()) < self.expires_at
+
+    def is_usable(self, now: Optional[float] = None) -> bool:
+        """Fresh, or stale but still inside its stale-while-revalidate window"""
+        return self.stale_until is None or (now or time.time()) < self.stale_until
+
+
+class ResponseCache:
+    """
+    Two-tier cache of decoded JSON payloads
+
+    Lookups hit an in-process LRU (survives warm invocations) and fall
+    back to SQLite (survives cold starts on the same instance). Entries
+    carry a TTL and a stale window: past the TTL an entry is stale but
+    may still be served while it is refreshed; past the stale window it
+    is treated as missing.
+
+        cache = ResponseCache()
+        cache.set(key, payload, ttl=3600, stale_ttl=86400)
+        entry = cache.get(key)
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256):
+        """
+        path: SQLite file (default $API_SPORTS_CACHE_PATH or the temp
+            dir, the only writable location on serverless hosts);
+            ":memory:" keeps the second tier in memory
+        max_entries: size of the in-process LRU tier
+        """
+        self.path = path or os.environ.get("API_SPORTS_CACHE_PATH") or os.path.join(
+            tempfile.gettempdir(), "api_sports_cache.sqlite3"
+        )
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = self._connect()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite tier; the cache degrades to memory-only if it can't"""
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL,"
+                " stale_until REAL)"
+            )
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            print(f"Response cache: SQLite unavailable ({e}), using memory only")
+            return None
+
+    # ============== ACCESS ==============
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Cached entry (fresh or stale-but-usable), or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.is_usable(now):
+                    self._memory.move_to_end(key)
+                    return entry
+                del self._memory[key]
+
+            entry = self._load(key)
+            if entry is None or not entry.is_usable(now):
+                return None
+            self._remember(key, entry)
+            return entry
+
+    def set(self, key: str, data: Any, ttl: Optional[float], stale_ttl: Optional[float] = 0.0):
+        """
+        Store a payload
+
+        ttl: seconds until stale (None = immutable)
+        stale_ttl: extra seconds a stale entry may still be served while
+            it is revalidated (None = forever)
+        """
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        stale_until = None if ttl is None or stale_ttl is None else expires_at + stale_ttl
+        entry = CacheEntry(data, now, expires_at, stale_until)
+
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                        (key, json.dumps(data), now, expires_at, stale_until)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Response cache write failed: {e}")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Delete entries past their stale window from SQLite; returns how many"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE stale_until IS NOT NULL AND stale_until < ?",
+                (time.time(),)
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # ============== INTERNALS ==============
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT payload, stored_at, expires_at, stale_until FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Response cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        payload, stored_at, expires_at, stale_until = row
+        return CacheEntry(json.loads(payload), stored_at, expires_at, stale_until)
+
+    def _remember(self, key: str, entry: CacheEntry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,247 @@
+"""
+Season Average Aggregation for NBA Players
+Vectorized, incrementally maintained per-player season totals
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Union
+
+from .game_log import GameLog, parse_minutes_array
+
+
+class SeasonAverages:
+    """
+    Running season totals for many players, stored as one array
+
+    Games are added in bulk (API-Sports rows, a GameLog or a
+    player_stats DataFrame) with one grouped sum per column, or one at
+    a time with add_game(); either way only the new games are touched.
+    A (player, game) pair is counted once, so overlapping refreshes
+    are harmless. averages() returns the same dict as
+    APISportsClient.get_player_season_averages.
+
+        league = SeasonAverages()
+        league.add_frame(db_rows)            # whole league at once
+        league.add_game(236, box_score_row)  # then incrementally
+        league.averages(236)
+    """
+
+    # Output total name -> GameLog field
+    COUNTERS = {
+        "points": "points",
+        "rebounds": "rebounds",
+        "assists": "assists",
+        "steals": "steals",
+        "blocks": "blocks",
+        "turnovers": "turnovers",
+        "fgm": "fgm",
+        "fga": "fga",
+        "tpm": "threes",
+        "tpa": "tpa",
+        "ftm": "ftm",
+        "fta": "fta",
+        "minutes": "minutes"
+    }
+
+    def __init__(self):
+        self._slots: Dict[int, int] = {}
+        self._totals = np.zeros((0, len(self.COUNTERS)))
+        self._games = np.zeros(0, dtype=np.int64)
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._slots
+
+    # ============== UPDATES ==============
+
+    def add(self, player_ids: Union[int, Iterable[int]], games: Union[GameLog, List[Dict]]) -> int:
+        """
+        Add games for one player (player_ids is an id) or many (one id
+        per game row). Returns how many new games were counted.
+        """
+        if not isinstance(games, GameLog):
+            games = list(games or [])
+        log = GameLog.coerce(games)
+        n = len(log)
+        if np.isscalar(player_ids):
+            player_ids = np.full(n, player_ids, dtype=np.int64)
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        if len(player_ids) != n:
+            raise ValueError("Need one player id per game")
+
+        values = np.column_stack([
+            log[field].astype(np.float64) for field in self.COUNTERS.values()
+        ]) if n else np.zeros((0, len(self.COUNTERS)))
+
+        # GameLog stores float32, which loses minutes precision; reparse
+        if n and not isinstance(games, GameLog):
+            values[:, -1] = parse_minutes_array([
+                r.get("minutes") if r.get("minutes") is not None else r.get("min")
+                for r in games
+            ])
+        return self._accumulate(player_ids, log.game_ids, values)
+
+    def add_game(self, player_id: int, game: Dict) -> bool:
+        """Add one game; False if it was already counted"""
+        return self.add(player_id, [game]) > 0
+
+    def add_frame(self, frame: Union[pd.DataFrame, List[Dict]]) -> int:
+        """
+        Add player_stats rows (player_id, game_id, points, rebounds, ...,
+        tpm, minutes) straight from their columns
+        """
+        frame = pd.DataFrame(frame)
+        if frame.empty:
+            return 0
+
+        # player_stats columns are named like the totals
+        columns = []
+        for name in self.COUNTERS:
+            if name not in frame:
+                columns.append(np.zeros(len(frame)))
+            elif name == "minutes" and frame[name].dtype == object:
+                columns.append(parse_minutes_array(frame[name].tolist()))
+            else:
+                columns.append(pd.to_numeric(frame[name], errors="coerce").fillna(0).to_numpy(np.float64))
+
+        game_ids = frame["game_id"].fillna(0).to_numpy(np.int64) if "game_id" in frame else np.zeros(len(frame), np.int64)
+        return self._accumulate(frame["player_id"].to_numpy(np.int64), game_ids, np.column_stack(columns))
+
+    def _accumulate(self, player_ids: np.ndarray, game_ids: np.ndarray, values: np.ndarray) -> int:
+        """Grouped sum of new (player, game) rows into the totals"""
+        with self._lock:
+            keep = np.ones(len(player_ids), dtype=bool)
+            for i, key in enumerate(zip(player_ids.tolist(), game_ids.tolist())):
+                if key[1] == 0:
+                    continue  # unknown game id: always counted
+                if key in self._seen:
+                    keep[i] = False
+                else:
+                    self._seen.add(key)
+            if not keep.any():
+                return 0
+            player_ids, values = player_ids[keep], values[keep]
+
+            players, inverse = np.unique(player_ids, return_inverse=True)
+            slots = np.array([self._slot(int(p)) for p in players])
+
+            sums = np.column_stack([
+                np.bincount(inverse, weights=values[:, j], minlength=len(players))
+                for j in range(values.shape[1])
+            ])
+            self._totals[slots] += sums
+            self._games[slots] += np.bincount(inverse, minlength=len(players))
+            return int(keep.sum())
+
+    def _slot(self, player_id: int) -> int:
+        slot = self._slots.get(player_id)
+        if slot is None:
+            slot = len(self._slots)
+            self._slots[player_id] = slot
+            if slot >= len(self._games):
+                grow = max(64, len(self._games))
+                self._totals = np.vstack([self._totals, np.zeros((grow, len(self.COUNTERS)))])
+                self._games = np.concatenate([self._games, np.zeros(grow, dtype=np.int64)])
+        return slot
+
+    def reset(self, player_id: Optional[int] = None):
+        """Forget one player (e.g. after a stat correction) or everyone"""
+        with self._lock:
+            if player_id is None:
+                self._slots.clear()
+                self._totals = np.zeros((0, len(self.COUNTERS)))
+                self._games = np.zeros(0, dtype=np.int64)
+                self._seen.clear()
+                return
+            slot = self._slots.get(player_id)
+            if slot is not None:
+                self._totals[slot] = 0
+                self._games[slot] = 0
+                self._seen = {key for key in self._seen if key[0] != player_id}
+
+    # ============== AVERAGES ==============
+
+    def averages(self, player_id: int) -> Dict:
+        """Season averages for one player ({} if no games)"""
+        return self.averages_many([player_id]).get(player_id, {})
+
+    def averages_many(self, player_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+        """Season averages for several players (default: all), computed in one pass"""
+        with self._lock:
+            ids = list(self._slots) if player_ids is None else [p for p in player_ids if p in self._slots]
+            slots = np.array([self._slots[p] for p in ids], dtype=np.intp)
+            totals = self._totals[slots].copy()
+            games = self._games[slots].copy()
+
+        table = _averages_table(totals, games)
+        names = list(self.COUNTERS)
+        result = {}
+        for i, player_id in enumerate(ids):
+            if games[i] == 0:
+                continue
+            # Python round() per value, to match the per-player loop exactly
+            row = {name: round(float(value), 1) for name, value in zip(table.dtype.names, table[i])}
+            player_totals = {"games": int(games[i])}
+            for j, name in enumerate(names):
+                value = totals[i, j]
+                player_totals[name] = int(value) if name != "minutes" and value == int(value) else float(value)
+            result[player_id] = {
+                "games_played": int(games[i]),
+                **row,
+                "totals": player_totals
+            }
+        return result
+
+    def frame(self) -> pd.DataFrame:
+        """All players' averages as a DataFrame indexed by player_id"""
+        with self._lock:
+            ids = list(self._slots)
+            slots = np.array([self._slots[p] for p in ids], dtype=np.intp)
+            totals = self._totals[slots].copy()
+            games = self._games[slots].copy()
+        table = pd.DataFrame(_averages_table(totals, games), index=pd.Index(ids, name="player_id")).round(1)
+        table.insert(0, "games_played", games)
+        return table[games > 0]
+
+
+def season_averages(stats: Union[GameLog, List[Dict]]) -> Dict:
+    """Season averages for one player's per-game rows (API-Sports or normalized)"""
+    aggregator = SeasonAverages()
+    aggregator.add(0, stats)
+    return aggregator.averages(0)
+
+
+def _averages_table(totals: np.ndarray, games: np.ndarray) -> np.ndarray:
+    """Per-game averages and shooting percentages (unrounded) for rows of totals"""
+    idx = {name: j for j, name in enumerate(SeasonAverages.COUNTERS)}
+    n = len(games)
+    safe_games = np.maximum(games, 1)
+
+    def per_game(name):
+        return totals[:, idx[name]] / safe_games
+
+    def pct(made, attempted):
+        att = totals[:, idx[attempted]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(att > 0, totals[:, idx[made]] / att * 100, 0)
+
+    table = np.zeros(n, dtype=[(name, np.float64) for name in (
+        "ppg", "rpg", "apg", "spg", "bpg", "topg", "mpg", "fg_pct", "three_pct", "ft_pct"
+    )])
+    table["ppg"] = per_game("points")
+    table["rpg"] = per_game("rebounds")
+    table["apg"] = per_game("assists")
+    table["spg"] = per_game("steals")
+    table["bpg"] = per_game("blocks")
+    table["topg"] = per_game("turnovers")
+    table["mpg"] = per_game("minutes")
+    table["fg_pct"] = pct("fgm", "fga")
+    table["three_pct"] = pct("tpm", "tpa")
+    table["ft_pct"] = pct("ftm", "fta")
+    return table
@@ -0,0 +1,246 @@
+"""
+Training Data Builder for NBA Player Props
+Point-in-time feature generation from the raw player_stats table
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Union
+
+from .ml_model import NBAStatPredictor
+
+
+# player_stats columns summed for each stat type
+STAT_COLUMNS = {
+    "points": ("points",),
+    "rebounds": ("rebounds",),
+    "assists": ("assists",),
+    "threes": ("tpm",),
+    "steals": ("steals",),
+    "blocks": ("blocks",),
+    "pra": ("points", "rebounds", "assists")
+}
+
+# League-average defensive rating used when an opponent has no history
+DEFAULT_DEF_RATING = 110.0
+
+
+def season_of(game_dates: pd.Series) -> pd.Series:
+    """NBA season (start year) for each game date: Oct-Dec belong to that year's season"""
+    dates = pd.to_datetime(game_dates)
+    return dates.dt.year - (dates.dt.month < 10).astype(int)
+
+
+def build_training_data(
+    player_stats: Union[pd.DataFrame, List[Dict]],
+    stat_types: Optional[Sequence[str]] = None,
+    recent_window: int = 10,
+    min_prior_games: int = 3,
+    line_offsets: Sequence[float] = (0.0,)
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build NBAStatPredictor.train() DataFrames from raw player_stats rows
+
+    Every feature for a game uses only that player's earlier games in
+    the same season (and the opponent's earlier games), so there is no
+    leakage from the game being predicted:
+
+    - season_avg: mean of prior games this season
+    - recent_avg_5 / recent_avg_3: mean of the last 5 / 3 prior games
+    - max_recent / min_recent / std_recent / minutes_avg: over the
+      last `recent_window` prior games
+    - opp_def_rating: points the opponent allowed per game before this
+      date (needs full box scores; league default otherwise)
+    - rest_days: days off since the player's previous game
+
+    player_stats has no betting lines, so a line is synthesized the
+    way books post them (the half-point above a blend of season and
+    recent average), shifted by each of `line_offsets` to give the
+    line-aware model several lines per game.
+
+    Returns {stat_type: DataFrame} with NBAStatPredictor.FEATURE_COLUMNS
+    plus player_id, game_id, game_date, actual, line, line_diff and hit.
+    """
+    df = pd.DataFrame(player_stats)
+    stat_types = list(stat_types or NBAStatPredictor.STAT_TYPES)
+
+    needed = {"player_id", "game_id", "game_date", "minutes", "is_home", "points"}
+    for stat in stat_types:
+        needed.update(STAT_COLUMNS[stat])
+    missing = needed - set(df.columns)
+    if missing:
+        raise ValueError(f"player_stats is missing columns: {sorted(missing)}")
+    if "opponent_id" not in df.columns:
+        df["opponent_id"] = -1
+    df["opponent_id"] = df["opponent_id"].fillna(-1)
+
+    df = df.assign(game_date=pd.to_datetime(df["game_date"]))
+    df = df.sort_values(["player_id", "game_date", "game_id"], kind="stable").reset_index(drop=True)
+
+    # Group boundaries: one group per (player, season)
+    season = season_of(df["game_date"]).to_numpy()
+    player = df["player_id"].to_numpy()
+    n = len(df)
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = (player[1:] != player[:-1]) | (season[1:] != season[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(n), 0))
+    prior_games = np.arange(n) - group_start
+
+    windows = _Windows(group_start, prior_games)
+
+    # Shared, stat-independent features
+    dates = df["game_date"].to_numpy()
+    gap_days = np.zeros(n)
+    gap_days[1:] = (dates[1:] - dates[:-1]) / np.timedelta64(1, "D")
+    rest_days = np.where(new_group, 3, np.clip(gap_days - 1, 0, 7))
+
+    minutes = df["minutes"].fillna(0).to_numpy(dtype=np.float64)
+    minutes_avg = windows.mean(minutes, recent_window, default=30.0)
+    is_home = df["is_home"].fillna(True).astype(float).to_numpy()
+    opp_def_rating = _opponent_def_rating(df)
+
+    keep = prior_games >= max(min_prior_games, 1)
+    base = pd.DataFrame({
+        "player_id": df["player_id"],
+        "game_id": df["game_id"],
+        "game_date": df["game_date"],
+        "is_home": is_home,
+        "opp_def_rating": opp_def_rating,
+        "rest_days": rest_days,
+        "minutes_avg": minutes_avg
+    })
+
+    results = {}
+    for stat in stat_types:
+        values = np.zeros(n)
+        for col in STAT_COLUMNS[stat]:
+            values += df[col].fillna(0).to_numpy(dtype=np.float64)
+
+        season_avg = windows.mean(values, None, default=0.0)
+        recent_avg_5 = windows.mean(values, 5, default=0.0)
+        recent_avg_3 = windows.mean(values, 3, default=0.0)
+        std_recent = windows.std(values, recent_window)
+        max_recent = windows.extreme(values, recent_window, np.maximum)
+        min_recent = windows.extreme(values, recent_window, np.minimum)
+
+        trend = np.where(
+            season_avg != 0,
+            (recent_avg_5 - season_avg) / np.maximum(season_avg, 1),
+            0.0
+        )
+
+        frame = base.assign(
+            season_avg=season_avg,
+            recent_avg_5=recent_avg_5,
+            recent_avg_3=recent_avg_3,
+            max_recent=max_recent,
+            min_recent=min_recent,
+            std_recent=std_recent,
+            trend=trend,
+            usage_proxy=trend * minutes_avg / 30,
+            actual=values
+        )[keep]
+
+        # Synthetic posted line: half-point above the blended average
+        anchor = np.floor(0.5 * frame["season_avg"] + 0.5 * frame["recent_avg_5"]) + 0.5
+        frames = []
+        for offset in line_offsets:
+            line = np.maximum(anchor + offset, 0.5)
+            frames.append(frame.assign(
+                line=line,
+                line_diff=line - frame["season_avg"],
+                hit=(frame["actual"] > line).astype(int)
+            ))
+
+        columns = (
+            ["player_id", "game_id", "game_date"]
+            + NBAStatPredictor.FEATURE_COLUMNS
+            + ["actual", "line", "line_diff", "hit"]
+        )
+        results[stat] = pd.concat(frames, ignore_index=True)[columns]
+
+    return results
+
+
+class _Windows:
+    """
+    Trailing-window statistics over prior rows within each group
+
+    Rows must be sorted by group then date. Row i's window covers the
+    up-to-k rows before it in its own group (never row i itself).
+    """
+
+    def __init__(self, group_start: np.ndarray, prior_games: np.ndarray):
+        self.group_start = group_start
+        self.prior_games = prior_games
+        self.index = np.arange(len(group_start))
+
+    def _bounds(self, k: Optional[int]):
+        """Start index of each row's window and its length"""
+        start = self.group_start if k is None else np.maximum(self.index - k, self.group_start)
+        return start, self.index - start
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        """prefix[i] = sum of values[:i]"""
+        prefix = np.zeros(len(values) + 1)
+        np.cumsum(values, out=prefix[1:])
+        return prefix
+
+    def mean(self, values: np.ndarray, k: Optional[int], default: float) -> np.ndarray:
+        start, count = self._bounds(k)
+        prefix = self._prefix(values)
+        total = prefix[self.index] - prefix[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, total / count, default)
+
+    def std(self, values: np.ndarray, k: Optional[int]) -> np.ndarray:
+        """Population std (0 with fewer than 2 prior games)"""
+        start, count = self._bounds(k)
+        prefix = self._prefix(values)
+        prefix_sq = self._prefix(values * values)
+        total = prefix[self.index] - prefix[start]
+        total_sq = prefix_sq[self.index] - prefix_sq[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = total_sq / count - (total / count) ** 2
+        return np.where(count > 1, np.sqrt(np.clip(var, 0, None)), 0.0)
+
+    def extreme(self, values: np.ndarray, k: int, op) -> np.ndarray:
+        """Rolling max/min (op = np.maximum / np.minimum); 0 with no prior games"""
+        fill = -np.inf if op is np.maximum else np.inf
+        result = np.full(len(values), fill)
+        for lag in range(1, k + 1):
+            src = self.index - lag
+            valid = src >= self.group_start
+            result = np.where(valid, op(result, values[np.maximum(src, 0)]), result)
+        return np.where(self.prior_games > 0, result, 0.0)
+
+
+def _opponent_def_rating(df: pd.DataFrame) -> np.ndarray:
+    """
+    Points allowed per game by each row's opponent, using only games
+    the opponent played before this date
+    """
+    if (df["opponent_id"] < 0).all():
+        return np.full(len(df), DEFAULT_DEF_RATING)
+
+    # Points scored against each team in each game
+    allowed = (
+        df.groupby(["opponent_id", "game_id"], sort=False)
+        .agg(game_date=("game_date", "first"), points=("points", "sum"))
+        .reset_index()
+        .sort_values(["opponent_id", "game_date", "game_id"], kind="stable")
+    )
+    grouped = allowed.groupby("opponent_id", sort=False)["points"]
+    prior_total = grouped.cumsum() - allowed["points"]
+    prior_games = grouped.cumcount()
+    allowed["opp_def_rating"] = np.where(
+        prior_games > 0, prior_total / prior_games.where(prior_games > 0, 1), DEFAULT_DEF_RATING
+    )
+
+    merged = df[["opponent_id", "game_id"]].merge(
+        allowed[["opponent_id", "game_id", "opp_def_rating"]],
+        on=["opponent_id", "game_id"],
+        how="left"
+    )
+    return merged["opp_def_rating"].fillna(DEFAULT_DEF_RATING).to_numpy()
@@ -205,6 +205,32 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function to get the last N games for many players in one query
+-- A LATERAL top-N per player walks idx_player_stats_player_date and stops
+-- after N rows, the same result as ROW_NUMBER() OVER (PARTITION BY
+-- player_id ORDER BY game_date DESC) <= N without ranking whole histories
+CREATE OR REPLACE FUNCTION get_recent_player_stats(
+    p_player_ids BIGINT[],
+    p_last_n INTEGER DEFAULT 10,
+    p_before DATE DEFAULT NULL
+)
+RETURNS SETOF player_stats AS $$
+BEGIN
+    RETURN QUERY
+    SELECT recent.*
+    FROM unnest(p_player_ids) AS ids(player_id)
+    CROSS JOIN LATERAL (
+        SELECT *
+        FROM player_stats s
+        WHERE s.player_id = ids.player_id
+            AND (p_before IS NULL OR s.game_date < p_before)
+        ORDER BY s.game_date DESC
+        LIMIT p_last_n
+    ) recent
+    ORDER BY recent.player_id, recent.game_date DESC;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
 -- Function to get hit rate for predictions
 CREATE OR REPLACE FUNCTION get_prediction_accuracy(
     p_stat_type VARCHAR DEFAULT NULL,
@@ -233,6 +259,72 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function to settle every open prediction for a game date in one statement
+-- Actual values come from player_stats (PRA and threes are derived); a
+-- prediction with no box-score row (e.g. the player did not play) stays open
+CREATE OR REPLACE FUNCTION settle_predictions(p_game_date DATE)
+RETURNS TABLE (
+    settled BIGINT,
+    hits BIGINT,
+    still_open BIGINT
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH actuals AS (
+        SELECT
+            p.id,
+            (CASE lower(p.stat_type)
+                WHEN 'points' THEN s.points
+                WHEN 'pts' THEN s.points
+                WHEN 'rebounds' THEN s.rebounds
+                WHEN 'reb' THEN s.rebounds
+                WHEN 'assists' THEN s.assists
+                WHEN 'ast' THEN s.assists
+                WHEN 'threes' THEN s.tpm
+                WHEN '3pm' THEN s.tpm
+                WHEN 'three-pointers' THEN s.tpm
+                WHEN 'steals' THEN s.steals
+                WHEN 'stl' THEN s.steals
+                WHEN 'blocks' THEN s.blocks
+                WHEN 'blk' THEN s.blocks
+                WHEN 'turnovers' THEN s.turnovers
+                WHEN 'pra' THEN s.points + s.rebounds + s.assists
+                WHEN 'pts+reb+ast' THEN s.points + s.rebounds + s.assists
+                WHEN 'points+rebounds+assists' THEN s.points + s.rebounds + s.assists
+            END)::DECIMAL AS actual
+        FROM predictions p
+        JOIN player_stats s
+            ON s.player_id = p.player_id
+            AND s.game_date = p.game_date
+            AND (p.game_id IS NULL OR s.game_id = p.game_id)
+        WHERE p.game_date = p_game_date
+            AND p.hit IS NULL
+    ),
+    updated AS (
+        UPDATE predictions p
+        SET
+            actual_value = a.actual,
+            hit = CASE
+                WHEN upper(p.predicted_direction) = 'OVER' THEN a.actual > p.line
+                ELSE a.actual < p.line
+            END,
+            settled_at = NOW()
+        FROM actuals a
+        WHERE p.id = a.id
+            AND a.actual IS NOT NULL
+        RETURNING p.hit
+    )
+    SELECT
+        COUNT(*)::BIGINT as settled,
+        COUNT(*) FILTER (WHERE updated.hit)::BIGINT as hits,
+        (
+            SELECT COUNT(*) FROM predictions
+            WHERE game_date = p_game_date AND hit IS NULL
+        )::BIGINT - COUNT(*)::BIGINT as still_open
+    FROM updated;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================
 -- VIEWS
 -- ============================================
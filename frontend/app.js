@@ -396,6 +396,8 @@ function App() {
     const newLeg = {
       id: Date.now(),
       player: player.name,
+      player_id: player.id,
+      team: player.team_name,
       stat: stat,
       line: parseFloat(line),
       direction: direction,
@@ -0,0 +1,9 @@
+"""
+Test Configuration
+Puts api/ on sys.path so tests import `utils.*` the way the handlers do
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
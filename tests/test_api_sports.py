@@ -0,0 +1,117 @@
+"""
+API-Sports Client Tests
+Caching of box scores across live reads and final ingestion
+"""
+
+from utils.api_sports import APISportsClient
+from utils.ingestion import GameDayIngestor
+from utils.response_cache import ResponseCache
+
+
+class FakeResponse:
+    status_code = 200
+    ok = True
+    headers = {}
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Answers games and box-score requests for one game whose score changes"""
+
+    def __init__(self):
+        self.points = 10
+        self.status = APISportsClient.LIVE_STATUS
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        endpoint = url.rsplit("/", 1)[-1] if "statistics" not in url else "players/statistics"
+        self.calls.append((endpoint, dict(params or {})))
+        if endpoint == "games":
+            return FakeResponse({"response": [self.game()]} if params.get("date") == "2024-12-25" else {"response": []})
+        return FakeResponse({"response": [{
+            "player": {"id": 7, "firstname": "A", "lastname": "B"},
+            "team": {"id": 1, "name": "Home"},
+            "min": "36:00",
+            "points": self.points,
+            "totReb": 5
+        }]})
+
+    def game(self):
+        return {
+            "id": 1,
+            "date": {"start": "2024-12-25T20:00:00.000Z"},
+            "status": {"short": self.status},
+            "teams": {"home": {"id": 1}, "visitors": {"id": 2}}
+        }
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = []
+        self.settled = []
+
+    def upsert_players(self, players, chunk_size=500):
+        pass
+
+    def upsert_player_stats(self, rows, chunk_size=500):
+        self.rows.extend(rows)
+
+    def settle_predictions(self, game_date):
+        self.settled.append(game_date)
+        return {"settled": len(self.rows)}
+
+
+def make_client(session):
+    client = APISportsClient(api_key="test", cache=ResponseCache(":memory:"), scheduler=False)
+    client.session = session
+    return client
+
+
+def test_final_box_score_ignores_entry_cached_mid_game():
+    session = FakeSession()
+    client = make_client(session)
+
+    # Live poller read: cached under the default, expiring policy
+    assert client.get_game_statistics(1, final=False, fresh=True)[0]["points"] == 10
+
+    session.points = 31
+    session.status = APISportsClient.FINISHED_STATUS
+    assert client.get_game_statistics(1, final=True)[0]["points"] == 31
+
+    # Now stored as immutable and served from cache
+    calls = len(session.calls)
+    assert client.get_game_statistics(1, final=True)[0]["points"] == 31
+    assert len(session.calls) == calls
+
+
+def test_ingestion_settles_on_final_box_score():
+    session = FakeSession()
+    client = make_client(session)
+    client.get_game_statistics(1, final=False)
+
+    session.points = 31
+    session.status = APISportsClient.FINISHED_STATUS
+    db = FakeDB()
+    report = GameDayIngestor(client=client, db=db).ingest_date("2024-12-25")
+
+    assert [row["points"] for row in db.rows] == [31]
+    assert report["settlement"] == {"settled": 1}
+
+
+def test_ingestion_reports_real_upstream_calls():
+    session = FakeSession()
+    session.status = APISportsClient.FINISHED_STATUS
+    client = make_client(session)
+    ingestor = GameDayIngestor(client=client, db=FakeDB())
+
+    # Two games lookups (both UTC days) and one box score
+    assert ingestor.ingest_date("2024-12-25")["upstream_calls"] == 3
+    assert len(session.calls) == 3
+
+    # Everything is cached the second time
+    assert ingestor.ingest_date("2024-12-25")["upstream_calls"] == 0
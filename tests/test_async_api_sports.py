@@ -0,0 +1,40 @@
+"""
+Async API-Sports Client Tests
+Fan-out width and attribute delegation
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.async_api_sports import AsyncAPISportsClient
+
+
+class SlowClient:
+    """Stands in for APISportsClient: every call takes one round trip"""
+
+    ROUND_TRIP = 0.2
+
+    def get_player_statistics(self, player_id, season=2024, last_n_games=None):
+        time.sleep(self.ROUND_TRIP)
+        return [{"player": {"id": player_id}}]
+
+
+def test_roster_fetched_in_one_round_trip():
+    async def fetch():
+        async with AsyncAPISportsClient(client=SlowClient()) as client:
+            return await client.get_players_statistics(range(15))
+
+    started = time.perf_counter()
+    stats = asyncio.run(fetch())
+
+    assert sorted(stats) == list(range(15))
+    assert time.perf_counter() - started < 2 * SlowClient.ROUND_TRIP
+
+
+def test_getattr_without_client_does_not_recurse():
+    client = AsyncAPISportsClient.__new__(AsyncAPISportsClient)
+
+    with pytest.raises(AttributeError):
+        client.get_player
@@ -0,0 +1,75 @@
+"""
+Supabase Client Tests
+Queries run against an in-memory stand-in that caps responses like PostgREST
+"""
+
+import pytest
+
+pytest.importorskip("supabase")
+
+from utils.database import SupabaseClient
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """The select/filter/order/range subset of the query builder used here"""
+
+    MAX_ROWS = 1000
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.orders = []
+        self.bounds = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.rows = [row for row in self.rows if row[column] in set(values)]
+        return self
+
+    def gte(self, column, value):
+        self.rows = [row for row in self.rows if row[column] >= value]
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append(column)
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda row: tuple(row[column] for column in self.orders))
+        if self.bounds:
+            rows = rows[self.bounds[0]:self.bounds[1] + 1]
+        return FakeResult(rows[:self.MAX_ROWS])
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, name):
+        return FakeQuery(self.rows)
+
+
+def test_stats_for_players_pages_past_row_limit():
+    rows = [
+        {"id": i, "player_id": i % 3 + 1, "game_date": f"2024-{11 + i // 1000:02d}-{i % 28 + 1:02d}", "points": i}
+        for i in range(2500)
+    ]
+    db = SupabaseClient.__new__(SupabaseClient)
+    db.client = FakeClient(rows)
+
+    stats = db.get_stats_for_players([1, 2], page_size=1000)
+
+    expected = [row for row in rows if row["player_id"] in (1, 2)]
+    assert len(expected) > FakeQuery.MAX_ROWS
+    assert sorted(row["id"] for row in stats) == sorted(row["id"] for row in expected)
+    assert [row["game_date"] for row in stats] == sorted(row["game_date"] for row in stats)
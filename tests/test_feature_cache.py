@@ -0,0 +1,48 @@
+"""
+Feature Cache Tests
+Cached rolling features must match what the predictor builds from the log
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from utils.feature_cache import FeatureCache
+from utils.ml_model import NBAStatPredictor
+
+
+def game_log(n=25, seed=3):
+    rng = np.random.default_rng(seed)
+    start = date(2024, 10, 25)
+    return [
+        {
+            "date": (start + timedelta(days=2 * i)).isoformat(),
+            "points": int(rng.integers(5, 40)),
+            "rebounds": int(rng.integers(0, 15)),
+            "assists": int(rng.integers(0, 12)),
+            "threes": int(rng.integers(0, 7)),
+            "steals": int(rng.integers(0, 4)),
+            "blocks": int(rng.integers(0, 4)),
+            "minutes": int(rng.integers(20, 40))
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("stat_type", NBAStatPredictor.STAT_TYPES)
+def test_cache_features_match_predictor(stat_type):
+    games = game_log()
+    season_avg = {"ppg": 22.4, "rpg": 6.1, "apg": 5.3, "tpg": 2.2, "spg": 1.1, "bpg": 0.7, "mpg": 33.0}
+
+    cache = FeatureCache(window=10)
+    cache.extend(1, games)
+    cached = cache.features(1, stat_type, season_avg, opponent_def_rating=112.5, is_home=False, rest_days=2)
+
+    # The predictor sees the same window, most recent first
+    expected = NBAStatPredictor(model_path="/nonexistent").prepare_features(
+        season_avg, games[::-1][:10], 112.5, False, 2, stats=[stat_type]
+    )[stat_type]
+
+    assert cached.shape == (len(NBAStatPredictor.FEATURE_COLUMNS),)
+    np.testing.assert_allclose(cached, expected, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,56 @@
+"""
+Model Registry Tests
+Versions stay immutable and fully checksummed
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from utils.ml_model import NBAStatPredictor
+from utils.model_registry import ModelRegistry
+
+
+def training_data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.normal(10, 3, (n, len(NBAStatPredictor.FEATURE_COLUMNS))), columns=NBAStatPredictor.FEATURE_COLUMNS)
+    data["line"] = data["season_avg"] + rng.normal(0, 2, n)
+    data["hit"] = (data["line"] < data["season_avg"]).astype(int)
+    return data
+
+
+@pytest.fixture
+def registry(tmp_path):
+    models = tmp_path / "models"
+    NBAStatPredictor(model_path=str(models)).train(training_data(), "points")
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.promote(registry.publish(str(models)))
+    return registry
+
+
+def test_export_compiled_publishes_new_version(registry):
+    predictor = NBAStatPredictor(registry=registry)
+    served = registry.current()
+    before = sorted(os.listdir(registry.path(served)))
+
+    paths = predictor.export_compiled(["points"])
+
+    assert sorted(os.listdir(registry.path(served))) == before
+    version = os.path.basename(os.path.dirname(paths["points"]))
+    assert version != served
+    assert "points_compiled.npz" in registry.verify(version)["files"]
+
+
+def test_verify_rejects_unlisted_files(registry):
+    version = registry.current()
+    registry.verify(version)
+
+    with open(os.path.join(registry.path(version), "points_compiled.npz"), "wb") as f:
+        f.write(b"not in the manifest")
+
+    with pytest.raises(ValueError, match="not in manifest"):
+        registry.verify(version)